@@ -34,7 +34,7 @@ echo ""
 print_status "Setting up build directory..."
 rm -rf "${BUILD_DIR}"
 mkdir -p "${APP_BUNDLE}/Contents/"{MacOS,Resources,Frameworks}
-mkdir -p "${RESOURCES_DIR}/"{models,whisper.cpp/bin,python_env}
+mkdir -p "${RESOURCES_DIR}/"{whisper.cpp/models,whisper.cpp/bin,python_env}
 print_success "Build directory created"
 
 # Check if model exists
@@ -49,8 +49,9 @@ fi
 
 # Copy model to app bundle
 print_status "Copying model to app bundle..."
-cp "${MODEL_SOURCE}" "${RESOURCES_DIR}/models/"
-print_success "Model copied ($(du -h "${RESOURCES_DIR}/models/ggml-base.en.bin" | cut -f1))"
+# whisper_cpp_wrapper.py finds whisper.cpp/{models,bin} next to itself in the bundle
+cp "${MODEL_SOURCE}" "${RESOURCES_DIR}/whisper.cpp/models/"
+print_success "Model copied ($(du -h "${RESOURCES_DIR}/whisper.cpp/models/ggml-base.en.bin" | cut -f1))"
 
 # Check if whisper-cli exists
 WHISPER_BUILD_DIR="$HOME/Applications/JarvisVoice_backup_20260208_230810/whisper.cpp/build"
@@ -248,141 +249,10 @@ SCRIPT
 chmod +x "${MACOS_DIR}/JarvisVoice"
 print_success "Launcher script created"
 
-# Patch main.py to use local imports
-print_status "Patching main.py for bundled imports..."
-sed -i '' 's|sys.path.insert(0, str(Path.home() / "Applications" / "JarvisVoice"))|# Using bundled whisper_cpp_wrapper|g' "${RESOURCES_DIR}/src/main.py"
-print_success "main.py patched"
-
-# Update whisper_cpp_wrapper.py to use bundled paths
-print_status "Patching whisper_cpp_wrapper.py for bundled paths..."
-cat > "${RESOURCES_DIR}/whisper_cpp_wrapper.py" << 'EOF'
-"""
-Whisper.cpp integration for Jarvis Voice
-Uses the bundled whisper-cli with Metal GPU acceleration
-"""
-
-import subprocess
-import tempfile
-import os
-import numpy as np
-import soundfile as sf
-from pathlib import Path
-import sys
-
-
-class WhisperCPP:
-    """Wrapper for whisper.cpp CLI"""
-
-    def __init__(self, model_name="base.en"):
-        """Initialize whisper.cpp transcriber"""
-        self.model_name = model_name
-        
-        # Determine paths based on whether we're bundled or not
-        if getattr(sys, 'frozen', False):
-            # Running in a bundle
-            bundle_dir = Path(sys.executable).parent.parent / "Resources"
-        else:
-            # Running in normal Python environment
-            # Check if we're in the bundled app structure
-            app_resources = Path(__file__).parent
-            if (app_resources / "models" / f"ggml-{model_name}.bin").exists():
-                bundle_dir = app_resources
-            else:
-                # Fallback to installed location
-                bundle_dir = Path.home() / "Applications" / "JarvisVoice"
-        
-        self.model_path = bundle_dir / "models" / f"ggml-{model_name}.bin"
-        self.cli_path = bundle_dir / "whisper.cpp" / "bin" / "whisper-cli"
-        
-        # If model not found in bundle, try fallback locations
-        if not self.model_path.exists():
-            fallback_paths = [
-                Path.home() / "Applications" / "JarvisVoice" / "whisper.cpp" / "models" / f"ggml-{model_name}.bin",
-                Path.home() / ".jarvisvoice" / "models" / f"ggml-{model_name}.bin",
-            ]
-            for fallback in fallback_paths:
-                if fallback.exists():
-                    self.model_path = fallback
-                    break
-        
-        # If cli not found in bundle, try fallback locations
-        if not self.cli_path.exists():
-            fallback_cli = Path.home() / "Applications" / "JarvisVoice" / "whisper.cpp" / "build" / "bin" / "whisper-cli"
-            if fallback_cli.exists():
-                self.cli_path = fallback_cli
-
-        if not self.model_path.exists():
-            raise FileNotFoundError(
-                f"Whisper AI model not found. Please reinstall the application.\n"
-                f"Expected at: {self.model_path}"
-            )
-
-        if not self.cli_path.exists():
-            raise FileNotFoundError(
-                f"whisper-cli not found. Please reinstall the application.\n"
-                f"Expected at: {self.cli_path}"
-            )
-
-    # Valid ISO 639-1 language codes supported by Whisper
-    VALID_LANGUAGES = {
-        "en", "zh", "de", "es", "ru", "ko", "fr", "ja", "pt", "tr", "pl", "ca",
-        "nl", "ar", "sv", "it", "id", "hi", "fi", "vi", "he", "uk", "el", "ms",
-        "cs", "ro", "da", "hu", "ta", "no", "th", "ur", "hr", "bg", "lt", "la",
-        "mi", "ml", "cy", "sk", "te", "fa", "lv", "bn", "sr", "az", "sl", "kn",
-        "et", "mk", "br", "eu", "is", "hy", "ne", "mn", "bs", "kk", "sq", "sw",
-        "gl", "mr", "pa", "si", "km", "sn", "yo", "so", "af", "oc", "ka", "be",
-        "tg", "sd", "gu", "am", "yi", "lo", "uz", "fo", "ht", "ps", "tk", "nn",
-        "mt", "sa", "lb", "my", "bo", "tl", "mg", "as", "tt", "haw", "ln", "ha",
-        "ba", "jw", "su",
-    }
-
-    def transcribe(self, audio_data: np.ndarray, language: str = "en") -> str:
-        """Transcribe audio using whisper.cpp"""
-        if len(audio_data) == 0:
-            return ""
-
-        # Validate language code to prevent command injection
-        if language not in self.VALID_LANGUAGES:
-            print(f"Warning: Invalid language code '{language}', defaulting to 'en'")
-            language = "en"
-
-        # Create temporary WAV file
-        with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
-            tmp_path = tmp_file.name
-
-        try:
-            # Save audio as 16-bit PCM WAV file (required by whisper.cpp)
-            sf.write(tmp_path, audio_data, 16000, subtype="PCM_16")
-
-            # Run whisper-cli
-            cmd = [
-                str(self.cli_path),
-                "-m", str(self.model_path),
-                "-f", tmp_path,
-                "-l", language,
-                "--no-timestamps",
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
-
-            if result.returncode != 0:
-                print(f"whisper.cpp error: {result.stderr}")
-                return ""
-
-            # Extract transcription from output
-            lines = result.stdout.strip().split("\n")
-            for line in lines:
-                if line and not line.startswith("whisper_") and not line.startswith("ggml_") and not line.startswith("["):
-                    return line.strip()
-
-            return ""
-
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-EOF
-print_success "whisper_cpp_wrapper.py patched"
+# Patch sources to use local imports
+print_status "Patching sources for bundled imports..."
+sed -i '' 's|sys.path.insert(0, str(Path.home() / "Applications" / "JarvisVoice"))|# Using bundled whisper_cpp_wrapper|g' "${RESOURCES_DIR}/src/"*.py
+print_success "Sources patched"
 
 # Create a post-install script that will be included
 print_status "Creating first-run setup script..."
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Jarvis Voice soak test
+Drives the hotkey-to-text pipeline headlessly against a stub whisper-cli and
+tracks threads, open files, temp files, RSS and latency over thousands of cycles
+
+Usage: python soak_harness.py [--cycles 2000] [--report-every 100] [--overlap]
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPO_DIR / "src"))
+sys.path.insert(0, str(REPO_DIR))
+
+# Import the repo's wrapper before main.py puts the installed copy on the path
+import whisper_cpp_wrapper
+import main
+from audio_processing import AudioConditioner, _synthetic_speech
+from audio_store import AudioStore
+from history import TranscriptHistory
+from profiles import ProfileManager
+from resource_manager import ResourceManager, process_rss_mb
+
+STUB_MODEL = "soak"
+
+STUB_CLI = """#!{python}
+import sys, time
+args = sys.argv[1:]
+time.sleep({delay})
+inputs = [args[i + 1] for i, arg in enumerate(args) if arg == "-f"]
+for path in inputs:
+    if "-otxt" in args:
+        with open(path + ".txt", "w") as f:
+            f.write(" hello from the stub decoder\\n")
+    else:
+        print(" hello from the stub decoder")
+"""
+
+
+class FakeInputStream:
+    """Stands in for sounddevice.InputStream, feeding synthetic audio from a thread"""
+
+    audio = _synthetic_speech(10)
+
+    def __init__(self, samplerate, channels, dtype, callback, blocksize):
+        self.callback = callback
+        self.blocksize = blocksize
+        self.block_s = blocksize / samplerate
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._feed, daemon=True)
+        self._thread.start()
+
+    def _feed(self):
+        position = 0
+        while not self._stopped.is_set():
+            block = self.audio[position : position + self.blocksize]
+            if len(block) < self.blocksize:
+                position = 0
+                continue
+            position += self.blocksize
+            self.callback(block.reshape(-1, 1), self.blocksize, None, None)
+            # Run faster than real time so soak runs finish in minutes
+            self._stopped.wait(self.block_s / 8)
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join()
+
+    def close(self):
+        pass
+
+
+class MockInjector:
+    """Replaces the Qt signals: records typed text instead of typing it"""
+
+    def __init__(self):
+        self.typed = threading.Event()
+        self.typed_at = None
+        self.count = 0
+        self.update_status = SimpleNamespace(emit=lambda status: None)
+        self.type_text = SimpleNamespace(emit=self._type)
+
+    def _type(self, text: str):
+        self.typed_at = time.perf_counter()
+        self.count += 1
+        self.typed.set()
+
+
+def create_stub_whisper(root: Path, delay_s: float) -> Path:
+    """Lay out a whisper.cpp directory with a fake model and stub CLI"""
+    (root / "models").mkdir(parents=True)
+    (root / "build" / "bin").mkdir(parents=True)
+    (root / "models" / f"ggml-{STUB_MODEL}.bin").write_bytes(os.urandom(1024 * 1024))
+    cli = root / "build" / "bin" / "whisper-cli"
+    cli.write_text(STUB_CLI.format(python=sys.executable, delay=delay_s))
+    cli.chmod(0o755)
+    return root
+
+
+def build_app(workdir: Path, injector: MockInjector, args):
+    """A JarvisVoiceApp with the real pipeline but no UI, hotkeys or microphone"""
+    app = main.JarvisVoiceApp.__new__(main.JarvisVoiceApp)
+    app.config = {
+        **main.DEFAULT_CONFIG,
+        "model_size": STUB_MODEL,
+        "batch_max_size": args.batch,
+    }
+    app.vocabulary = {"custom_words": ["Jarvis"], "context_phrases": []}
+    app.corrections = {"auto_corrections": {"stub decoder": "Stub Decoder"}}
+    app.profiles = ProfileManager(workdir / "profiles.json", app.corrections, app.vocabulary)
+    app.history = TranscriptHistory(workdir / "history.db")
+    app.audio_store = None
+    if args.retain_audio:
+        app.audio_store = AudioStore(workdir / "audio", max_bytes=4 * 1024 * 1024)
+    app.recorder = main.AudioRecorder()
+    app.conditioner = AudioConditioner()
+    app.transcriber = None
+    app.comm = injector
+    app.status_item = SimpleNamespace(title="")
+    app.is_recording = False
+    app.hotkey_pressed = False
+    app.model_loaded = False
+    app._current_job = None
+    app._memory_warned = False
+    app.resources = ResourceManager(
+        load=app._load_transcriber, unload=app._unload_transcriber, idle_timeout_s=0
+    )
+    app.resources.load()
+    return app
+
+
+def open_fd_count():
+    """Open file descriptors of this process, if the platform exposes them"""
+    try:
+        return len(os.listdir("/dev/fd"))
+    except OSError:
+        return None
+
+
+def sample(tmp_dir: Path, latencies: list) -> dict:
+    """Snapshot of the resources a leak would grow"""
+    return {
+        "threads": threading.active_count(),
+        "fds": open_fd_count(),
+        "temp_files": sum(1 for _ in tmp_dir.iterdir()),
+        "rss_mb": round(process_rss_mb() or 0, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "p95_ms": round(sorted(latencies)[int(len(latencies) * 0.95)] * 1000, 1)
+        if latencies
+        else None,
+    }
+
+
+def run(args) -> int:
+    """Run the soak and return a process exit code"""
+    workdir = Path(tempfile.mkdtemp(prefix="jarvis-soak-"))
+    try:
+        with open(os.devnull, "w") as quiet:
+            return soak(workdir, quiet, args)
+    finally:
+        tempfile.tempdir = None
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def soak(workdir: Path, quiet, args) -> int:
+    """Drive the press/release cycles inside workdir"""
+    tmp_dir = workdir / "tmp"
+    tmp_dir.mkdir()
+    tempfile.tempdir = str(tmp_dir)  # WAV and batch files land here
+
+    whisper_cpp_wrapper.WHISPER_DIR = create_stub_whisper(workdir / "whisper.cpp", args.decode_s)
+    main.sd.InputStream = FakeInputStream
+
+    injector = MockInjector()
+    report = sys.stderr
+
+    with redirect_stdout(report if args.verbose else quiet):
+        app = build_app(workdir, injector, args)
+        try:
+            samples = []
+            window = []
+            timeouts = 0
+
+            print(
+                f"{'cycle':>7} {'threads':>7} {'fds':>5} {'tmp':>4} {'rss_mb':>8} "
+                f"{'p50_ms':>8} {'p95_ms':>8}",
+                file=report,
+            )
+            for cycle in range(1, args.cycles + 1):
+                injector.typed.clear()
+                app._start_recording()
+                time.sleep(args.hold_s)
+                released = time.perf_counter()
+                app._stop_recording()
+
+                if not args.overlap:
+                    if injector.typed.wait(args.timeout_s):
+                        window.append(injector.typed_at - released)
+                    else:
+                        timeouts += 1
+
+                if cycle % args.report_every == 0:
+                    snapshot = {"cycle": cycle, **sample(tmp_dir, window)}
+                    samples.append(snapshot)
+                    window = []
+                    print(
+                        f"{cycle:>7} {snapshot['threads']:>7} {snapshot['fds']!s:>5} "
+                        f"{snapshot['temp_files']:>4} {snapshot['rss_mb']:>8} "
+                        f"{snapshot['p50_ms']!s:>8} {snapshot['p95_ms']!s:>8}",
+                        file=report,
+                    )
+
+            # Let in-flight work finish before the final measurement
+            deadline = time.monotonic() + args.timeout_s
+            while app._current_job is not None and time.monotonic() < deadline:
+                time.sleep(0.05)
+            app.history.flush()
+            gc.collect()
+            final = sample(tmp_dir, [])
+        finally:
+            if app.transcriber:
+                app.transcriber.close()
+            app.history.close()
+
+    return summarize(samples, final, timeouts, injector.count, args)
+
+
+def summarize(samples: list, final: dict, timeouts: int, typed: int, args) -> int:
+    """Compare the first and last windows and flag growth"""
+    print(f"\nTyped {typed} results, {timeouts} timeouts", file=sys.stderr)
+    if len(samples) < 2:
+        print("Not enough samples to judge drift; raise --cycles", file=sys.stderr)
+        return 0
+
+    baseline, last = samples[0], samples[-1]
+    problems = []
+    if final["threads"] > baseline["threads"] + 2:
+        problems.append(f"threads grew {baseline['threads']} -> {final['threads']}")
+    if final["fds"] is not None and final["fds"] > baseline["fds"] + 5:
+        problems.append(f"open fds grew {baseline['fds']} -> {final['fds']}")
+    if final["temp_files"] > 0:
+        problems.append(f"{final['temp_files']} temp files left behind")
+    if last["rss_mb"] - baseline["rss_mb"] > args.max_rss_growth_mb:
+        problems.append(f"RSS grew {baseline['rss_mb']} -> {last['rss_mb']} MB")
+    if baseline["p50_ms"] and last["p50_ms"] and last["p50_ms"] > baseline["p50_ms"] * 1.5:
+        problems.append(f"p50 latency drifted {baseline['p50_ms']} -> {last['p50_ms']} ms")
+    if timeouts:
+        problems.append(f"{timeouts} cycles never produced text")
+
+    for problem in problems:
+        print(f"LEAK/DRIFT: {problem}", file=sys.stderr)
+    if not problems:
+        print("No leaks or drift detected", file=sys.stderr)
+    return 1 if problems else 0
+
+
+def main_cli():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Soak test the dictation pipeline")
+    parser.add_argument("--cycles", type=int, default=2000, help="Press/release cycles")
+    parser.add_argument("--report-every", type=int, default=100, help="Cycles per sample")
+    parser.add_argument("--hold-s", type=float, default=0.05, help="Hotkey hold time")
+    parser.add_argument("--decode-s", type=float, default=0.02, help="Stub decode time")
+    parser.add_argument("--timeout-s", type=float, default=10, help="Wait for text")
+    parser.add_argument("--batch", type=int, default=4, help="batch_max_size")
+    parser.add_argument(
+        "--overlap",
+        action="store_true",
+        help="Don't wait for text, so new recordings supersede pending decodes",
+    )
+    parser.add_argument(
+        "--retain-audio", action="store_true", help="Store every recording (evicting at 4 MB)"
+    )
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50)
+    parser.add_argument("--verbose", action="store_true", help="Show app output")
+    sys.exit(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Audio conditioning for Jarvis Voice
+Vectorized high-pass, spectral noise gate and level normalization before decoding
+
+Run directly to benchmark: python src/audio_processing.py [clip.wav "reference text" model]
+"""
+
+import sys
+import time
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class AudioConditioner:
+    """Cleans up microphone audio for whisper
+
+    Works on a 50%-overlap STFT with a periodic Hann window, which overlap-adds
+    back to the input exactly, so with every stage disabled audio passes
+    through unchanged. process() conditions a whole clip; process_chunk() and
+    flush() do the same incrementally for streaming.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frame_size: int = 512,
+        highpass_hz: float = 80,
+        noise_gate: bool = True,
+        gate_threshold: float = 1.5,  # Multiple of the noise floor that is removed
+        gate_floor_db: float = -20,  # Most a bin is attenuated by the gate
+        target_rms_dbfs: float = -20,
+        max_gain_db: float = 30,
+        peak_dbfs: float = -1,
+    ):
+        self.sample_rate = sample_rate
+        self.frame_size = frame_size
+        self.hop = frame_size // 2
+        self.window = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(frame_size) / frame_size)).astype(
+            np.float32
+        )
+        self.cutoff_bin = int(np.ceil(highpass_hz * frame_size / sample_rate))
+        self.noise_gate = noise_gate
+        self.gate_threshold = gate_threshold
+        self.gate_floor = 10 ** (gate_floor_db / 20)
+        self.target_rms = 10 ** (target_rms_dbfs / 20)
+        self.max_gain = 10 ** (max_gain_db / 20)
+        self.peak = 10 ** (peak_dbfs / 20)
+        self.reset()
+
+    def reset(self):
+        """Clear streaming state"""
+        self._pending = np.zeros(self.hop, dtype=np.float32)  # Leading pad
+        self._ola_tail = np.zeros(self.hop, dtype=np.float32)
+        self._noise = None
+        self._gain = 1.0
+        self._skip = self.hop
+        self._samples_in = 0
+        self._samples_out = 0
+
+    def _spectra(self, padded: np.ndarray) -> np.ndarray:
+        """Windowed spectra of every full frame in a padded buffer"""
+        frames = sliding_window_view(padded, self.frame_size)[:: self.hop]
+        return np.fft.rfft(frames * self.window, axis=1)
+
+    def _noise_floor(self, magnitude: np.ndarray) -> np.ndarray:
+        """Per-bin noise estimate: mean spectrum of the quietest 10% of frames"""
+        count = max(1, len(magnitude) // 10)
+        energy = np.einsum("ij,ij->i", magnitude, magnitude)
+        quietest = np.argpartition(energy, count - 1)[:count]
+        return magnitude[quietest].mean(axis=0)
+
+    def _filter(self, spectra: np.ndarray, magnitude: np.ndarray, noise) -> np.ndarray:
+        """High-pass and spectral gate, returning time-domain frames"""
+        spectra[:, : self.cutoff_bin] = 0
+        if self.noise_gate and noise is not None:
+            gain = 1 - self.gate_threshold * noise / np.maximum(magnitude, 1e-10)
+            spectra *= np.clip(gain, self.gate_floor, 1)
+        return np.fft.irfft(spectra, n=self.frame_size, axis=1).astype(np.float32)
+
+    def _overlap_add(self, frames: np.ndarray, tail: np.ndarray):
+        """Overlap-add half-overlapping frames; returns (samples, new tail)"""
+        first = frames[:, : self.hop]
+        second = frames[:, self.hop :]
+        out = first.copy()
+        out[0] += tail
+        out[1:] += second[:-1]
+        return out.ravel(), second[-1].copy()
+
+    def _speech_rms(self, audio: np.ndarray) -> float:
+        """RMS over hop-sized blocks within 20 dB of the loudest block"""
+        blocks = len(audio) // self.hop
+        if blocks == 0:
+            return float(np.sqrt(np.mean(audio ** 2))) if len(audio) else 0.0
+        rms = np.sqrt(np.mean(audio[: blocks * self.hop].reshape(blocks, -1) ** 2, axis=1))
+        active = rms[rms >= rms.max() * 0.1]
+        return float(np.sqrt(np.mean(active ** 2)))
+
+    def _target_gain(self, audio: np.ndarray) -> float:
+        """Gain reaching the target RMS without exceeding max gain or the peak"""
+        speech_rms = self._speech_rms(audio)
+        peak = float(np.max(np.abs(audio))) if len(audio) else 0.0
+        if speech_rms <= 1e-6 or peak <= 1e-6:
+            return 1.0
+        return min(self.target_rms / speech_rms, self.max_gain, self.peak / peak)
+
+    def process(self, audio: np.ndarray) -> np.ndarray:
+        """Condition a complete clip"""
+        if len(audio) == 0:
+            return audio.astype(np.float32)
+
+        x = audio.astype(np.float32).ravel()
+        x = x - x.mean()  # DC removal
+        n = len(x)
+
+        # Pad a hop on the left and enough on the right to cover whole frames
+        total = self.hop + n
+        right = self.hop + (-(total - self.hop)) % self.hop
+        padded = np.concatenate(
+            [np.zeros(self.hop, np.float32), x, np.zeros(right, np.float32)]
+        )
+
+        spectra = self._spectra(padded)
+        magnitude = np.abs(spectra) if self.noise_gate else None
+        noise = self._noise_floor(magnitude) if self.noise_gate else None
+        frames = self._filter(spectra, magnitude, noise)
+        y, _ = self._overlap_add(frames, np.zeros(self.hop, np.float32))
+        y = y[self.hop : self.hop + n]
+
+        return (y * self._target_gain(y)).astype(np.float32)
+
+    def process_chunk(self, chunk: np.ndarray) -> np.ndarray:
+        """Condition streamed audio; output lags input by under one frame"""
+        chunk = chunk.astype(np.float32).ravel()
+        self._samples_in += len(chunk)
+        self._pending = np.concatenate([self._pending, chunk])
+        if len(self._pending) < self.frame_size:
+            return np.zeros(0, dtype=np.float32)
+
+        count = (len(self._pending) - self.frame_size) // self.hop + 1
+        used = (count - 1) * self.hop + self.frame_size
+        spectra = self._spectra(self._pending[:used])
+        self._pending = self._pending[count * self.hop :]
+
+        # Noise floor tracks the quietest frames, rising slowly if the room gets louder
+        magnitude = None
+        if self.noise_gate:
+            magnitude = np.abs(spectra)
+            floor = self._noise_floor(magnitude)
+            self._noise = floor if self._noise is None else np.minimum(self._noise * 1.05, floor)
+        frames = self._filter(spectra, magnitude, self._noise)
+        out, self._ola_tail = self._overlap_add(frames, self._ola_tail)
+
+        if self._skip:
+            skipped = min(self._skip, len(out))
+            out = out[skipped:]
+            self._skip -= skipped
+
+        # Smooth gain changes between chunks, then hard-limit peaks
+        speech_rms = self._speech_rms(out)
+        if speech_rms > 1e-4:
+            self._gain = 0.8 * self._gain + 0.2 * min(self.target_rms / speech_rms, self.max_gain)
+        out = np.clip(out * self._gain, -self.peak, self.peak)
+        self._samples_out += len(out)
+        return out.astype(np.float32)
+
+    def flush(self) -> np.ndarray:
+        """Return the remaining conditioned samples and reset for the next stream"""
+        remaining = self._samples_in - self._samples_out
+        out = self.process_chunk(np.zeros(self.frame_size, dtype=np.float32))
+        out = out[: max(0, remaining)]
+        self.reset()
+        return out
+
+
+def _synthetic_speech(seconds: float, sample_rate: int = 16000, seed: int = 0) -> np.ndarray:
+    """Quiet, noisy, DC-offset bursts of harmonics standing in for speech"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    pitch = 140 + 30 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(pitch) / sample_rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = (np.sin(2 * np.pi * 1.5 * t) > 0).astype(np.float32)
+    hum = 0.02 * np.sin(2 * np.pi * 50 * t)
+    noise = 0.01 * rng.standard_normal(len(t))
+    return (0.03 * voiced * envelope + hum + noise + 0.05).astype(np.float32)
+
+
+def benchmark(seconds: float = 60, runs: int = 5):
+    """Time batch and streaming conditioning on synthetic audio"""
+    audio = _synthetic_speech(seconds)
+    conditioner = AudioConditioner()
+    conditioner.process(audio)  # Warm-up
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        conditioner.process(audio)
+    batch_ms = (time.perf_counter() - start) / runs * 1000
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        for i in range(0, len(audio), 1024):
+            conditioner.process_chunk(audio[i : i + 1024])
+        conditioner.flush()
+    stream_ms = (time.perf_counter() - start) / runs * 1000
+
+    print(f"Conditioning {seconds:.0f}s of audio:")
+    print(f"  whole clip: {batch_ms:.1f} ms ({batch_ms / seconds * 60:.1f} ms per minute)")
+    print(f"  streaming (1024-sample blocks): {stream_ms:.1f} ms")
+
+
+def benchmark_wer(clip_path: str, reference: str, model_name: str):
+    """Compare WER of raw and conditioned audio on a real clip"""
+    import soundfile as sf
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path.home() / "Applications" / "JarvisVoice"))
+    from whisper_cpp_wrapper import WhisperCPP, word_error_rate
+
+    audio, _ = sf.read(clip_path, dtype="float32")
+    model = WhisperCPP(model_name)
+    try:
+        for label, clip in (("raw", audio), ("conditioned", AudioConditioner().process(audio))):
+            text = model.transcribe(clip)
+            print(f"  {label}: WER {word_error_rate(reference, text):.3f}  {text!r}")
+    finally:
+        model.close()
+
+
+if __name__ == "__main__":
+    benchmark()
+    if len(sys.argv) == 4:
+        benchmark_wer(*sys.argv[1:])
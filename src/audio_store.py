@@ -0,0 +1,126 @@
+"""
+Audio retention for Jarvis Voice
+Keeps each utterance's audio as FLAC, keyed by utterance id, for re-decoding later
+"""
+
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import soundfile as sf
+
+
+class AudioStore:
+    """Bounded store of utterance audio
+
+    Audio is written as 16-bit FLAC (roughly a third of raw float32 size
+    for speech) under <utterance id>.flac, with the identifiers of the app
+    it was dictated into kept in the file's comment tag. The index of files, oldest
+    first, is kept in memory so eviction by total size and age never
+    rescans the directory.
+    """
+
+    def __init__(
+        self,
+        directory,
+        max_bytes: int = 500 * 1024 * 1024,
+        max_age_s: Optional[float] = 7 * 24 * 3600,
+        sample_rate: int = 16000,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.sample_rate = sample_rate
+        self._lock = threading.Lock()
+        self._index = OrderedDict()  # utterance id -> (mtime, size), oldest first
+        self._total_bytes = 0
+        self._scan()
+
+    def _scan(self):
+        """Index files left by earlier sessions"""
+        entries = []
+        for path in self.directory.glob("*.flac"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.stem, stat.st_size))
+        for mtime, utterance_id, size in sorted(entries):
+            self._index[utterance_id] = (mtime, size)
+            self._total_bytes += size
+        with self._lock:
+            self._evict()
+
+    def _path(self, utterance_id: str) -> Path:
+        return self.directory / f"{utterance_id}.flac"
+
+    def save(self, utterance_id: str, audio: np.ndarray, app_id=None):
+        """Store an utterance's audio, evicting old entries if over budget"""
+        if len(audio) == 0:
+            return
+        samples = np.clip(np.asarray(audio, dtype=np.float32).ravel(), -1, 1)
+
+        # Write then rename so a crash never leaves a truncated file indexed
+        fd, tmp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f, sf.SoundFile(
+                f, "w", self.sample_rate, 1, format="FLAC", subtype="PCM_16"
+            ) as flac:
+                identifiers = (app_id,) if isinstance(app_id, str) else app_id or ()
+                if any(identifiers):
+                    flac.comment = "\n".join(i or "" for i in identifiers)
+                flac.write(samples)
+            path = self._path(utterance_id)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        size = path.stat().st_size
+        with self._lock:
+            previous = self._index.pop(utterance_id, None)
+            if previous:
+                self._total_bytes -= previous[1]
+            self._index[utterance_id] = (time.time(), size)
+            self._total_bytes += size
+            self._evict()
+
+    def load(self, utterance_id: str) -> Optional[tuple]:
+        """(audio, app identifiers) for an utterance, or None if never stored or evicted"""
+        try:
+            with sf.SoundFile(str(self._path(utterance_id))) as flac:
+                comment = flac.comment
+                return flac.read(dtype="float32"), tuple(comment.split("\n")) if comment else None
+        except (OSError, RuntimeError):  # soundfile raises RuntimeError subclasses
+            return None
+
+    def latest(self) -> Optional[str]:
+        """Id of the most recently stored utterance"""
+        with self._lock:
+            return next(reversed(self._index), None)
+
+    def _evict(self):
+        """Delete entries past the age limit, then oldest first until under budget"""
+        cutoff = time.time() - self.max_age_s if self.max_age_s else None
+        while self._index:
+            utterance_id, (mtime, size) = next(iter(self._index.items()))
+            expired = cutoff is not None and mtime < cutoff
+            if not expired and self._total_bytes <= self.max_bytes:
+                break
+            self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                self._path(utterance_id).unlink()
+            except OSError:
+                pass
+
+    def stats(self) -> str:
+        """Short summary for the settings window"""
+        with self._lock:
+            return f"{len(self._index)} clips, {self._total_bytes / 1024 / 1024:.1f} MB"
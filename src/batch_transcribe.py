@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Jarvis Voice batch transcription
+Transcribes audio files through the micro-batching scheduler
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+import soundfile as sf
+
+# Add whisper.cpp wrapper to path
+sys.path.insert(0, str(Path.home() / "Applications" / "JarvisVoice"))
+from whisper_cpp_wrapper import WhisperCPP
+from batching import BatchScheduler
+from metrics import METRICS
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(description="Transcribe 16 kHz audio files")
+    parser.add_argument("files", nargs="+", help="Audio files (16 kHz)")
+    parser.add_argument("-m", "--model", default="base.en", help="Model name")
+    parser.add_argument("-l", "--language", default="en", help="Language code")
+    parser.add_argument("-t", "--threads", default="auto", help="Decoder threads")
+    parser.add_argument("--prompt", default=None, help="Initial prompt (vocabulary)")
+    parser.add_argument("--max-batch", type=int, default=8, help="Files per decoder run")
+    parser.add_argument("--max-wait-ms", type=float, default=25, help="Batching window")
+    parser.add_argument(
+        "--metrics-textfile", default=None, help="Write Prometheus metrics here when done"
+    )
+    args = parser.parse_args()
+
+    model = WhisperCPP(args.model, threads=args.threads)
+
+    def decode_batch(clips, language, cancel_event=None, prompt=None):
+        try:
+            if len(clips) == 1:
+                texts = [model.transcribe(clips[0], language, cancel_event, prompt)]
+            else:
+                texts = model.transcribe_batch(clips, language, cancel_event, prompt)
+        except subprocess.TimeoutExpired:
+            METRICS.inc("decoder_runs_total")
+            METRICS.inc("decode_timeouts_total")
+            raise
+        METRICS.record_decode(model.last_trace)
+        return texts
+
+    scheduler = BatchScheduler(
+        decode_batch, max_batch=args.max_batch, max_wait_ms=args.max_wait_ms
+    )
+
+    futures = []
+    for path in args.files:
+        audio, sample_rate = sf.read(path, dtype="float32")
+        if sample_rate != 16000:
+            print(f"Skipping {path}: expected 16000 Hz, got {sample_rate}", file=sys.stderr)
+            continue
+        if audio.ndim > 1:
+            audio = audio.mean(axis=1)
+        futures.append((path, scheduler.submit(audio, args.language, prompt=args.prompt)))
+        METRICS.inc("audio_seconds_total", len(audio) / sample_rate)
+
+    exit_code = 0
+    for path, future in futures:
+        try:
+            text = future.result()
+            METRICS.inc("utterances_total")
+            if not text:
+                METRICS.inc("empty_results_total")
+            print(f"{path}: {text}")
+        except Exception as e:
+            print(f"{path}: error: {e}", file=sys.stderr)
+            exit_code = 1
+
+    scheduler.stop()
+    model.close()
+    print(f"Batching: {scheduler.stats()}", file=sys.stderr)
+    if args.metrics_textfile:
+        METRICS.write_textfile(args.metrics_textfile)
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Micro-batching scheduler for Jarvis Voice
+Groups queued decode requests for the same model/language/prompt into one whisper-cli run
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import CancelledError, Future, TimeoutError as FuturesTimeout
+from typing import Callable
+
+import numpy as np
+
+
+class _AllCancelled:
+    """Cancellation view of a batch: set only once every request is cancelled"""
+
+    def __init__(self, events: list):
+        self.events = events
+
+    def is_set(self) -> bool:
+        return bool(self.events) and all(event.is_set() for event in self.events)
+
+
+class BatchScheduler:
+    """Collects pending requests and decodes them in batches
+
+    A batch is dispatched when it reaches max_batch requests or when its
+    oldest request has waited max_wait_ms, whichever comes first. Requests
+    that arrive while a batch is decoding queue up and form the next batch,
+    so bursts are batched even with max_wait_ms = 0.
+
+    Only requests with the same language and prompt share a batch.
+    decode_batch(clips, language, cancel_event, prompt) is handed an event
+    that is set once every request in the batch has been cancelled.
+    """
+
+    def __init__(
+        self,
+        decode_batch: Callable[[list, str, object, object], list],
+        max_batch: int = 4,
+        max_wait_ms: float = 25,
+        sample_rate: int = 16000,
+    ):
+        self.decode_batch = decode_batch
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000
+        self.sample_rate = sample_rate
+
+        self._pending = deque()  # ((language, prompt), audio, future, enqueued_at, cancel_event)
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "audio_s": 0.0,
+            "queue_delay_s": 0.0,
+            "decode_s": 0.0,
+            "by_size": {},  # batch size -> [batches, decode seconds]
+        }
+
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(
+        self, audio: np.ndarray, language: str = "en", cancel_event=None, prompt=None
+    ) -> Future:
+        """Queue audio for decoding and return a Future for its text"""
+        future = Future()
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Batch scheduler is stopped")
+            self._pending.append(
+                ((language, prompt), audio, future, time.perf_counter(), cancel_event)
+            )
+            self._cond.notify()
+        return future
+
+    def transcribe(
+        self, audio: np.ndarray, language: str = "en", cancel_event=None, prompt=None
+    ) -> str:
+        """Submit and wait for the result, returning "" as soon as cancelled"""
+        future = self.submit(audio, language, cancel_event, prompt)
+        if cancel_event is None:
+            return future.result()
+
+        while not cancel_event.is_set():
+            try:
+                return future.result(timeout=0.05)
+            except FuturesTimeout:
+                continue
+            except CancelledError:  # Dropped by the worker after cancel_event was set
+                return ""
+        future.cancel()
+        return ""
+
+    def stop(self):
+        """Stop the worker; requests still queued are cancelled"""
+        with self._cond:
+            self._stopped = True
+            while self._pending:
+                self._pending.popleft()[2].cancel()
+            self._cond.notify()
+        self._worker.join(timeout=5)
+
+    def _take_batch(self):
+        """Wait for a dispatchable batch of requests sharing language and prompt"""
+        with self._cond:
+            while not self._pending and not self._stopped:
+                self._cond.wait()
+            if self._stopped:
+                return None, []
+
+            key = self._pending[0][0]
+            deadline = self._pending[0][3] + self.max_wait
+            while not self._stopped:
+                same = sum(1 for request in self._pending if request[0] == key)
+                remaining = deadline - time.perf_counter()
+                if same >= self.max_batch or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch, rest = [], deque()
+            for request in self._pending:
+                if request[0] == key and len(batch) < self.max_batch:
+                    batch.append(request)
+                else:
+                    rest.append(request)
+            self._pending = rest
+            return key, batch
+
+    def _run(self):
+        """Worker loop dispatching batches to the decoder"""
+        while True:
+            key, batch = self._take_batch()
+            if key is None:
+                break
+            language, prompt = key
+
+            # Drop requests cancelled while they were queued
+            for request in batch:
+                if request[4] is not None and request[4].is_set():
+                    request[2].cancel()
+            batch = [r for r in batch if r[2].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+
+            # A shared decoder run is only aborted once nobody wants its output
+            events = [r[4] for r in batch]
+            cancel_event = _AllCancelled(events) if all(events) else None
+
+            dispatched = time.perf_counter()
+            try:
+                texts = self.decode_batch(
+                    [r[1] for r in batch], language, cancel_event, prompt
+                )
+                for request, text in zip(batch, texts):
+                    request[2].set_result(text)
+            except Exception as e:
+                for request in batch:
+                    request[2].set_exception(e)
+            self._record(batch, dispatched, time.perf_counter())
+
+    def _record(self, batch: list, dispatched: float, finished: float):
+        """Update throughput and queueing statistics"""
+        with self._cond:
+            stats = self._stats
+            stats["requests"] += len(batch)
+            stats["batches"] += 1
+            stats["audio_s"] += sum(len(r[1]) for r in batch) / self.sample_rate
+            stats["queue_delay_s"] += sum(dispatched - r[3] for r in batch)
+            stats["decode_s"] += finished - dispatched
+            by_size = stats["by_size"].setdefault(len(batch), [0, 0.0])
+            by_size[0] += 1
+            by_size[1] += finished - dispatched
+
+    def stats(self) -> dict:
+        """Throughput gained by batching versus the queueing delay it adds"""
+        with self._cond:
+            stats = self._stats
+            requests = stats["requests"] or 1
+            by_size = {
+                size: round(decode_s / (batches * size) * 1000, 1)
+                for size, (batches, decode_s) in sorted(stats["by_size"].items())
+            }
+            per_request_ms = stats["decode_s"] / requests * 1000
+            summary = {
+                "requests": stats["requests"],
+                "batches": stats["batches"],
+                "avg_batch_size": round(stats["requests"] / (stats["batches"] or 1), 2),
+                "avg_queue_delay_ms": round(stats["queue_delay_s"] / requests * 1000, 1),
+                "decode_ms_per_request": round(per_request_ms, 1),
+                "decode_ms_per_request_by_batch_size": by_size,
+                "audio_s_per_decode_s": round(
+                    stats["audio_s"] / stats["decode_s"], 2
+                ) if stats["decode_s"] else None,
+            }
+            # Speed-up relative to unbatched decodes, once both have been seen
+            if 1 in by_size and per_request_ms:
+                summary["throughput_gain"] = round(by_size[1] / per_request_ms, 2)
+            return summary
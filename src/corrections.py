@@ -0,0 +1,196 @@
+"""
+Correction matching and mining for Jarvis Voice
+Compiled auto-correction matcher, fuzzy vocabulary index and history miner
+"""
+
+import re
+from collections import Counter, defaultdict
+from typing import Iterable
+
+
+WORD_RE = re.compile(r"[\w'-]+")
+
+
+def levenshtein(a: str, b: str, max_distance: int = None) -> int:
+    """Edit distance between two strings, stopping early past max_distance"""
+    if a == b:
+        return 0
+    if len(a) < len(b):
+        a, b = b, a
+    if max_distance is not None and len(a) - len(b) > max_distance:
+        return max_distance + 1
+
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            )
+        if max_distance is not None and min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+
+def _trie_pattern(node: dict) -> str:
+    """Render a character trie as a regex that prefers the longest entry"""
+    ends_here = "" in node
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not ends_here:
+        return branches[0]
+    group = "(?:" + "|".join(branches) + ")"
+    # Greedy optional: match the longer entry when possible, else stop here
+    return group + "?" if ends_here else group
+
+
+class CorrectionMatcher:
+    """Applies a corrections map in one regex pass
+
+    The map is compiled once into a trie-shaped pattern, so lookups stay
+    fast with tens of thousands of entries. Matching is case-insensitive
+    and prefers the longest entry, like applying them longest-first.
+    """
+
+    def __init__(self, corrections_map: dict):
+        self.replacements = {
+            wrong.lower(): correct for wrong, correct in corrections_map.items() if wrong
+        }
+        self.pattern = None
+        if self.replacements:
+            trie = {}
+            for wrong in self.replacements:
+                node = trie
+                for char in wrong:
+                    node = node.setdefault(char, {})
+                node[""] = {}
+            self.pattern = re.compile(_trie_pattern(trie), re.IGNORECASE)
+
+    def apply(self, text: str) -> str:
+        """Replace every known mistake in text"""
+        if not text or self.pattern is None:
+            return text
+        return self.pattern.sub(
+            lambda m: self.replacements.get(m.group(0).lower(), m.group(0)), text
+        )
+
+
+class VocabularyIndex:
+    """Fuzzy lookup of vocabulary terms using symmetric-delete (SymSpell)
+
+    Every term's deletions (up to max_distance, over a fixed-length prefix)
+    are precomputed into a hash map, so a lookup only hashes the query's own
+    deletions and verifies the few candidates that collide.
+    """
+
+    def __init__(self, terms: Iterable[str], max_distance: int = 2, prefix_length: int = 7):
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self.terms = {}
+        self._deletes = defaultdict(set)
+        for term in terms:
+            self.add(term)
+
+    def _deletions(self, word: str) -> set:
+        """All strings reachable from word's prefix by up to max_distance deletes"""
+        results = {word[: self.prefix_length]}
+        frontier = set(results)
+        for _ in range(self.max_distance):
+            frontier = {
+                candidate[:i] + candidate[i + 1 :]
+                for candidate in frontier
+                for i in range(len(candidate))
+            }
+            results |= frontier
+        return results
+
+    def add(self, term: str):
+        """Index a vocabulary term"""
+        key = term.strip().lower()
+        if not key or key in self.terms:
+            return
+        self.terms[key] = term.strip()
+        for deletion in self._deletions(key):
+            self._deletes[deletion].add(key)
+
+    def lookup(self, word: str, max_distance: int = None) -> list:
+        """Vocabulary terms within max_distance of word, as (distance, term)"""
+        if max_distance is None:
+            max_distance = self.max_distance
+        query = word.lower()
+
+        candidates = set()
+        for deletion in self._deletions(query):
+            candidates |= self._deletes.get(deletion, set())
+
+        matches = []
+        for key in candidates:
+            distance = levenshtein(query, key, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, self.terms[key]))
+        return sorted(matches)
+
+
+class CorrectionMiner:
+    """Proposes auto-corrections from transcript history
+
+    Phrases in the raw transcripts that are recurring near-miss spellings
+    of vocabulary terms are proposed. The corrected text in history is the
+    app's own output, not user edits, so diffing it against the raw text
+    would only rediscover existing corrections and is not mined.
+    """
+
+    def __init__(self, min_count: int = 2, min_length: int = 4, max_ngram: int = 3):
+        self.min_count = min_count
+        self.min_length = min_length
+        self.max_ngram = max_ngram
+
+    def _allowed_distance(self, phrase: str) -> int:
+        """Short phrases only tolerate one edit to limit false positives"""
+        return 1 if len(phrase) <= 5 else 2
+
+    def _near_misses(self, words: list, index: VocabularyIndex, counts: Counter):
+        """Count n-grams that are close but not equal to a vocabulary term"""
+        for n in range(1, self.max_ngram + 1):
+            for i in range(len(words) - n + 1):
+                phrase = " ".join(words[i : i + n]).lower()
+                if len(phrase) < self.min_length:
+                    continue
+                matches = index.lookup(phrase, self._allowed_distance(phrase))
+                if matches and matches[0][0] > 0:
+                    counts[(phrase, matches[0][1])] += 1
+
+    def mine(
+        self,
+        entries: Iterable[dict],
+        custom_words: Iterable[str],
+        existing: dict,
+        rejected: Iterable[str] = (),
+    ) -> dict:
+        """Return proposed corrections as {wrong: correct}"""
+        index = VocabularyIndex(custom_words)
+        if not index.terms:
+            return {}
+        counts = Counter()
+
+        for entry in entries:
+            self._near_misses(WORD_RE.findall(entry.get("raw_text") or ""), index, counts)
+
+        known = {wrong.lower() for wrong in existing}
+        known.update(wrong.lower() for wrong in rejected)
+
+        proposals = {}
+        best_counts = {}
+        for (wrong, correct), count in counts.items():
+            if count < self.min_count or wrong in known or wrong == correct.lower():
+                continue
+            if count > best_counts.get(wrong, 0):
+                proposals[wrong] = correct
+                best_counts[wrong] = count
+        return proposals
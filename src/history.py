@@ -0,0 +1,189 @@
+"""
+Transcript history for Jarvis Voice
+Append-only SQLite store with FTS5 full-text search, written off the hot path
+"""
+
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS utterances (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    raw_text TEXT NOT NULL,
+    corrected_text TEXT NOT NULL,
+    model TEXT,
+    language TEXT,
+    audio_seconds REAL,
+    decode_ms REAL,
+    total_ms REAL
+);
+CREATE INDEX IF NOT EXISTS utterances_created_at ON utterances (created_at);
+"""
+
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS utterances_fts USING fts5(
+    raw_text, corrected_text, content='utterances', content_rowid='rowid'
+);
+"""
+
+COLUMNS = (
+    "id",
+    "created_at",
+    "raw_text",
+    "corrected_text",
+    "model",
+    "language",
+    "audio_seconds",
+    "decode_ms",
+    "total_ms",
+)
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 prefix query, quoting every term"""
+    terms = ['"' + term.replace('"', '""') + '"*' for term in text.split()]
+    return " ".join(terms)
+
+
+class TranscriptHistory:
+    """Records every utterance and searches past transcripts"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self._queue = queue.Queue()
+        self._last = None
+
+        # Reader connection; the writer thread opens its own
+        self._read_lock = threading.Lock()
+        self._reader = self._connect(check_same_thread=False)
+        self.fts_enabled = self._init_schema(self._reader)
+
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def _connect(self, check_same_thread=True) -> sqlite3.Connection:
+        """Open a connection in WAL mode so reads never block the writer"""
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=check_same_thread)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection) -> bool:
+        """Create tables, returning whether FTS5 is available"""
+        conn.executescript(SCHEMA)
+        try:
+            conn.executescript(FTS_SCHEMA)
+            return True
+        except sqlite3.OperationalError:
+            print("Note: SQLite FTS5 unavailable, history search will be slower")
+            return False
+
+    def record(
+        self,
+        raw_text: str,
+        corrected_text: str,
+        model: Optional[str] = None,
+        language: Optional[str] = None,
+        audio_seconds: Optional[float] = None,
+        decode_ms: Optional[float] = None,
+        total_ms: Optional[float] = None,
+    ) -> str:
+        """Queue an utterance for storage and return its id"""
+        entry = {
+            "id": uuid.uuid4().hex,
+            "created_at": time.time(),
+            "raw_text": raw_text,
+            "corrected_text": corrected_text,
+            "model": model,
+            "language": language,
+            "audio_seconds": audio_seconds,
+            "decode_ms": decode_ms,
+            "total_ms": total_ms,
+        }
+        self._last = entry
+        self._queue.put(entry)
+        return entry["id"]
+
+    def _write_loop(self):
+        """Drain queued utterances into the database"""
+        conn = self._connect()
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        insert = f"INSERT INTO utterances ({', '.join(COLUMNS)}) VALUES ({placeholders})"
+
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            try:
+                with conn:
+                    cursor = conn.execute(insert, [entry[c] for c in COLUMNS])
+                    if self.fts_enabled:
+                        conn.execute(
+                            "INSERT INTO utterances_fts (rowid, raw_text, corrected_text) "
+                            "VALUES (?, ?, ?)",
+                            (cursor.lastrowid, entry["raw_text"], entry["corrected_text"]),
+                        )
+            except sqlite3.Error as e:
+                print(f"Error writing history: {e}")
+            finally:
+                self._queue.task_done()
+
+        conn.close()
+
+    def last(self) -> Optional[dict]:
+        """Most recent utterance, served from memory when possible"""
+        if self._last is not None:
+            return self._last
+        recent = self.recent(1)
+        return recent[0] if recent else None
+
+    def recent(self, limit: int = 20) -> list:
+        """Latest utterances, newest first"""
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT * FROM utterances ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def search(self, text: str, limit: int = 20) -> list:
+        """Full-text search over raw and corrected transcripts, newest first"""
+        if not text.strip():
+            return self.recent(limit)
+
+        with self._read_lock:
+            if self.fts_enabled:
+                rows = self._reader.execute(
+                    "SELECT u.* FROM utterances_fts f "
+                    "JOIN utterances u ON u.rowid = f.rowid "
+                    "WHERE utterances_fts MATCH ? "
+                    "ORDER BY u.created_at DESC LIMIT ?",
+                    (_fts_query(text), limit),
+                ).fetchall()
+            else:
+                pattern = f"%{text.strip()}%"
+                rows = self._reader.execute(
+                    "SELECT * FROM utterances "
+                    "WHERE raw_text LIKE ? OR corrected_text LIKE ? "
+                    "ORDER BY created_at DESC LIMIT ?",
+                    (pattern, pattern, limit),
+                ).fetchall()
+        return [dict(row) for row in rows]
+
+    def flush(self):
+        """Block until every queued utterance has been written"""
+        self._queue.join()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        with self._read_lock:
+            self._reader.close()
@@ -10,8 +10,10 @@ import threading
 import json
 import time
 import re
+import uuid
 from pathlib import Path
 from typing import Optional
+import subprocess
 from subprocess import run
 
 import rumps
@@ -23,7 +25,17 @@ from pynput.mouse import Controller as MouseController, Button
 
 # Add whisper.cpp wrapper to path
 sys.path.insert(0, str(Path.home() / "Applications" / "JarvisVoice"))
-from whisper_cpp_wrapper import WhisperCPP
+from whisper_cpp_wrapper import WhisperCPP, ModelRegistry
+from history import TranscriptHistory
+from corrections import CorrectionMiner
+from profiles import ProfileManager, frontmost_app
+from service import TranscriptionService, ServiceError
+from batching import BatchScheduler
+from resource_manager import ResourceManager
+from audio_processing import AudioConditioner
+from profiler import SamplingProfiler
+from metrics import METRICS
+from audio_store import AudioStore
 from PyQt6.QtWidgets import QApplication, QWidget, QVBoxLayout, QLabel
 from PyQt6.QtCore import Qt, QTimer, pyqtSignal, QObject, QRectF
 from PyQt6.QtGui import QFont, QPainter, QColor, QBrush, QPainterPath
@@ -33,6 +45,11 @@ CONFIG_DIR = Path.home() / ".jarvisvoice"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 VOCAB_FILE = CONFIG_DIR / "vocabulary.json"
 CORRECTIONS_FILE = CONFIG_DIR / "corrections.json"
+CALIBRATION_FILE = CONFIG_DIR / "model_calibration.json"
+HISTORY_FILE = CONFIG_DIR / "history.db"
+PROFILES_FILE = CONFIG_DIR / "profiles.json"
+PROFILER_DIR = CONFIG_DIR / "profiles"
+AUDIO_DIR = CONFIG_DIR / "audio"
 
 DEFAULT_CONFIG = {
     "hotkey": "ctrl",
@@ -40,6 +57,36 @@ DEFAULT_CONFIG = {
     "language": "en",
     "typing_delay": 0.01,
     "auto_paste": True,
+    # If set, pick the most accurate calibrated model decoding the reference
+    # clip within this many milliseconds instead of using model_size
+    "max_latency_ms": None,
+    "decoder_threads": "auto",  # or a fixed whisper-cli -t value
+    "decoder_processors": 1,
+    "pin_decoder_cores": False,  # Keep decoders off the first CPU (Linux only)
+    "history_enabled": True,
+    "correction_mining_interval": 3600,  # Seconds between mining runs, 0 disables
+    "correction_mining_window": 5000,  # Most recent utterances to mine
+    "service_enabled": False,  # Serve the loaded model on localhost for other tools
+    "service_port": 8765,
+    "service_per_client_limit": 2,
+    "batch_max_size": 4,  # Queued requests decoded per whisper-cli run (1 disables)
+    # Longest a request waits for others to batch with. Requests arriving while
+    # a batch decodes still batch at 0, so solo dictations aren't delayed
+    "batch_max_wait_ms": 0,
+    "cancel_key": "esc",  # Aborts the recording or decode in progress
+    "drop_superseded_jobs": True,  # A new recording cancels the pending decode
+    "model_idle_unload_s": 1800,  # Unload the model after this long unused, 0 keeps it
+    "memory_limit_mb": None,  # Unload the model when process RSS exceeds this
+    # High-pass, noise gate and level normalization. Off until benchmark_wer in
+    # audio_processing.py shows no WER regression on your microphone
+    "audio_conditioning": False,
+    "profile_duration_s": 10,  # Length of a menu-triggered profiler capture
+    # Prometheus textfile for node_exporter's textfile collector, None disables
+    "metrics_textfile": None,
+    "metrics_interval_s": 15,
+    "audio_retention": False,  # Keep recordings (FLAC) so they can be re-decoded
+    "audio_retention_mb": 500,  # Oldest recordings are deleted past this size
+    "audio_retention_days": 7,
 }
 
 DEFAULT_VOCABULARY = {
@@ -49,6 +96,8 @@ DEFAULT_VOCABULARY = {
 
 DEFAULT_CORRECTIONS = {
     "auto_corrections": {},  # Empty by default - user adds their own
+    "suggested_corrections": {},  # Mined from history, awaiting review
+    "rejected_suggestions": [],
 }
 
 
@@ -104,28 +153,88 @@ class AudioRecorder:
 class WhisperTranscriber:
     """Handles Whisper transcription using whisper.cpp"""
 
-    def __init__(self, model_size="base.en"):
+    def __init__(
+        self,
+        model_size="base.en",
+        threads="auto",
+        processors=1,
+        pin_cores=False,
+        batch_max_size=1,
+        batch_max_wait_ms=0,
+    ):
         self.model_size = model_size
+        self.threads = threads
+        self.processors = processors
+        self.pin_cores = pin_cores
         self.model = None
         self._load_model()
 
+        # Concurrent requests (service clients, rapid dictation) share decoder runs
+        self.scheduler = None
+        if batch_max_size > 1:
+            self.scheduler = BatchScheduler(
+                self._decode_batch, max_batch=batch_max_size, max_wait_ms=batch_max_wait_ms
+            )
+
     def _load_model(self):
         """Load the Whisper model"""
         print(f"Loading Whisper model: {self.model_size}...")
 
         try:
-            self.model = WhisperCPP(self.model_size)
-            print("Model loaded successfully!")
+            self.model = WhisperCPP(
+                self.model_size,
+                threads=self.threads,
+                processors=self.processors,
+                pin_cores=self.pin_cores,
+            )
+            print(f"Model loaded successfully! ({self.model.threads} decoder threads)")
         except Exception as e:
             print(f"Error loading model: {e}")
             raise
 
-    def transcribe(self, audio_data: np.ndarray, language: str = "en") -> str:
-        """Transcribe audio to text"""
+    def transcribe(
+        self, audio_data: np.ndarray, language: str = "en", cancel_event=None, prompt=None
+    ) -> str:
+        """Transcribe audio to text, returning "" if cancel_event is set"""
         if len(audio_data) == 0:
             return ""
 
-        return self.model.transcribe(audio_data, language)
+        if self.scheduler:
+            return self.scheduler.transcribe(audio_data, language, cancel_event, prompt)
+        return self._decode_batch([audio_data], language, cancel_event, prompt)[0]
+
+    def close(self):
+        """Stop the scheduler and release the model"""
+        if self.scheduler:
+            self.scheduler.stop()
+        if self.model:
+            self.model.close()
+
+    def _decode_batch(
+        self, audio_clips: list, language: str, cancel_event=None, prompt=None
+    ) -> list:
+        """Decode a batch from the scheduler, single clips the usual way"""
+        previous = self.model.last_trace
+        try:
+            if len(audio_clips) == 1:
+                texts = [self.model.transcribe(audio_clips[0], language, cancel_event, prompt)]
+            else:
+                texts = self.model.transcribe_batch(audio_clips, language, cancel_event, prompt)
+        except subprocess.TimeoutExpired:
+            METRICS.inc("decoder_runs_total")
+            METRICS.inc("decode_timeouts_total")
+            raise
+
+        if self.model.last_trace is not previous:  # Skipped if cancelled before starting
+            METRICS.record_decode(
+                self.model.last_trace, cancelled=bool(cancel_event and cancel_event.is_set())
+            )
+        return texts
+
+    @property
+    def last_trace(self) -> dict:
+        """Timings and decoder settings of the most recent transcription"""
+        return self.model.last_trace if self.model else {}
 
 
 class FloatingWindow(QWidget):
@@ -231,8 +340,36 @@ class JarvisVoiceApp:
         self.vocabulary = self._load_vocabulary()
         self.corrections = self._load_corrections()
 
+        # Per-app corrections/vocabulary, compiled on first use
+        self.profiles = ProfileManager(PROFILES_FILE, self.corrections, self.vocabulary)
+
+        # Transcript history (written asynchronously)
+        self.history = None
+        if self.config.get("history_enabled", True):
+            try:
+                self.history = TranscriptHistory(HISTORY_FILE)
+            except Exception as e:
+                print(f"Error opening history: {e}")
+
+        # Recorded audio kept for re-transcribing with another model
+        self.audio_store = None
+        if self.config.get("audio_retention", False):
+            try:
+                self.audio_store = AudioStore(
+                    AUDIO_DIR,
+                    max_bytes=self.config.get("audio_retention_mb", 500) * 1024 * 1024,
+                    max_age_s=self.config.get("audio_retention_days", 7) * 24 * 3600,
+                )
+            except Exception as e:
+                print(f"Error opening audio store: {e}")
+
         # Initialize components
         self.recorder = AudioRecorder()
+        self.conditioner = (
+            AudioConditioner(sample_rate=self.recorder.sample_rate)
+            if self.config.get("audio_conditioning", False)
+            else None
+        )
         self.transcriber = None
         self.keyboard = KeyboardController()
         self.mouse = MouseController()
@@ -248,9 +385,24 @@ class JarvisVoiceApp:
         self.is_recording = False
         self.hotkey_pressed = False
         self.model_loaded = False
+        self._current_job = None  # Cancel event of the decode in flight
+        self._memory_warned = False
+
+        # Unloads the model when idle or over the memory limit
+        self.resources = ResourceManager(
+            load=self._load_transcriber,
+            unload=self._unload_transcriber,
+            idle_timeout_s=self.config.get("model_idle_unload_s", 1800),
+            memory_limit_mb=self.config.get("memory_limit_mb"),
+            on_over_limit=self._on_memory_limit,
+        )
 
         # Create status item first (needed by _setup_menu)
         self.status_item = rumps.MenuItem("Status: Loading model...")
+        self.profiler = SamplingProfiler(PROFILER_DIR)
+        self.profile_item = rumps.MenuItem(
+            "🔬 Capture Profile", callback=self._toggle_profiler
+        )
 
         # Menu bar app
         self.app = rumps.App("Jarvis Voice", "🎤", quit_button=None)
@@ -261,6 +413,33 @@ class JarvisVoiceApp:
 
         # Load model in background
         threading.Thread(target=self._init_model, daemon=True).start()
+        self.resources.start()
+
+        # Optional local API sharing the loaded model
+        self.service = None
+        if self.config.get("service_enabled", False):
+            try:
+                self.service = TranscriptionService(
+                    self._service_transcribe,
+                    port=self.config.get("service_port", 8765),
+                    # One worker per batch slot so concurrent clients can share a run
+                    workers=max(1, self.config.get("batch_max_size", 4)),
+                    per_client_limit=self.config.get("service_per_client_limit", 2),
+                )
+                self.service.start()
+            except Exception as e:
+                print(f"Error starting transcription service: {e}")
+                self.service = None
+
+        # Counters and histograms for fleet monitoring (also served at /metrics)
+        if self.config.get("metrics_textfile"):
+            METRICS.start_textfile_writer(
+                self.config["metrics_textfile"], self.config.get("metrics_interval_s", 15)
+            )
+
+        # Periodically mine history for new correction suggestions
+        if self.history and self.config.get("correction_mining_interval", 3600) > 0:
+            threading.Thread(target=self._correction_mining_loop, daemon=True).start()
 
     def _load_config(self) -> dict:
         """Load or create config"""
@@ -296,39 +475,112 @@ class JarvisVoiceApp:
         """Save corrections to file"""
         with open(CORRECTIONS_FILE, "w") as f:
             json.dump(self.corrections, f, indent=2)
+        # Recompile profile matchers on next use
+        self.profiles.invalidate()
 
-    def _process_text_with_corrections(self, text: str) -> str:
+    def _process_text_with_corrections(self, text: str, app_id=None) -> str:
         """Apply auto-corrections and vocabulary to transcribed text"""
         if not text:
             return text
 
-        # Apply auto-corrections (case-insensitive matching)
-        corrections_map = self.corrections.get("auto_corrections", {})
-
-        # Sort by length (longest first) to avoid partial replacements
-        for wrong, correct in sorted(
-            corrections_map.items(), key=lambda x: len(x[0]), reverse=True
-        ):
-            # Case-insensitive replacement using pre-imported re module
-            pattern = re.compile(re.escape(wrong), re.IGNORECASE)
-            text = pattern.sub(correct, text)
+        # Compiled once per profile and corrections change; longest match wins
+        return self.profiles.get(app_id).matcher.apply(text)
 
-        return text
+    def _correction_mining_loop(self):
+        """Background job proposing corrections mined from history"""
+        interval = self.config.get("correction_mining_interval", 3600)
+        miner = CorrectionMiner()
+        while True:
+            time.sleep(interval)
+            try:
+                entries = self.history.recent(
+                    self.config.get("correction_mining_window", 5000)
+                )
+                suggestions = self.corrections.setdefault("suggested_corrections", {})
+                proposals = miner.mine(
+                    entries,
+                    self.vocabulary.get("custom_words", []),
+                    # Phrases a profile already corrects are handled per app
+                    existing={
+                        **self.corrections.get("auto_corrections", {}),
+                        **self.profiles.profile_corrections(),
+                        **suggestions,
+                    },
+                    rejected=self.corrections.get("rejected_suggestions", []),
+                )
+                if proposals:
+                    suggestions.update(proposals)
+                    self._save_corrections()
+                    print(f"Mined {len(proposals)} correction suggestions: {proposals}")
+                    rumps.notification(
+                        "Jarvis Voice",
+                        "💡 New Correction Suggestions",
+                        f"{len(proposals)} suggestions ready to review",
+                    )
+            except Exception as e:
+                print(f"Error mining corrections: {e}")
 
     def _save_config(self):
         """Save config to file"""
         with open(CONFIG_FILE, "w") as f:
             json.dump(self.config, f, indent=2)
 
+    def _select_model(self) -> str:
+        """Resolve the model to load from config and calibration results"""
+        model_size = self.config.get("model_size", "base")
+        max_latency_ms = self.config.get("max_latency_ms")
+        if max_latency_ms is None:
+            return model_size
+
+        registry = ModelRegistry(calibration_file=CALIBRATION_FILE)
+        selected = registry.select(max_latency_ms, self.config.get("language", "en"))
+        if selected is None:
+            print("No calibrated models yet, using model_size from config")
+            return model_size
+
+        print(f"Selected model {selected} for latency budget {max_latency_ms}ms")
+        return selected
+
+    def _load_transcriber(self):
+        """Create the transcriber (called by the resource manager)"""
+        model_size = self._select_model()
+        print(f"Loading model: {model_size}...", flush=True)
+        self.transcriber = WhisperTranscriber(
+            model_size,
+            threads=self.config.get("decoder_threads", "auto"),
+            processors=self.config.get("decoder_processors", 1),
+            pin_cores=self.config.get("pin_decoder_cores", False),
+            batch_max_size=self.config.get("batch_max_size", 4),
+            batch_max_wait_ms=self.config.get("batch_max_wait_ms", 0),
+        )
+        self.model_loaded = True
+        self.status_item.title = "Status: Ready"
+        print(f"Model loaded successfully: {model_size}", flush=True)
+
+    def _unload_transcriber(self):
+        """Release the transcriber (called by the resource manager)"""
+        transcriber = self.transcriber
+        self.model_loaded = False
+        self.transcriber = None
+        if transcriber:
+            transcriber.close()
+        self.status_item.title = "Status: Idle (model unloaded)"
+
+    def _on_memory_limit(self, rss_mb: float):
+        """Warn once when the process exceeds its memory ceiling"""
+        print(f"Memory limit exceeded: {rss_mb:.0f}MB")
+        if not self._memory_warned:
+            self._memory_warned = True
+            rumps.notification(
+                "Jarvis Voice",
+                "⚠️ Memory Limit",
+                f"Using {rss_mb:.0f}MB (limit {self.config.get('memory_limit_mb')}MB)",
+            )
+
     def _init_model(self):
         """Initialize Whisper model"""
         try:
-            model_size = self.config.get("model_size", "base")
-            print(f"Loading model: {model_size}...", flush=True)
-            self.transcriber = WhisperTranscriber(model_size)
-            self.model_loaded = True
-            self.status_item.title = "Status: Ready"
-            print(f"Model loaded successfully: {model_size}", flush=True)
+            self.resources.load()
         except Exception as e:
             print(f"Error loading model: {e}", flush=True)
             import traceback
@@ -336,19 +588,36 @@ class JarvisVoiceApp:
             traceback.print_exc()
             self.status_item.title = f"Status: Error - {e}"
 
+    def _service_transcribe(self, audio_data: np.ndarray, language: str) -> str:
+        """Transcribe a request from the local service with the shared model"""
+        with self.resources.in_use():
+            self.resources.ensure_loaded(60)
+            transcriber = self.transcriber
+            if not self.model_loaded or not transcriber:
+                raise ServiceError(503, "Model is still loading")
+            return transcriber.transcribe(audio_data, language)
+
     def _setup_menu(self):
         """Setup menu bar menu"""
         self.app.menu = [
             self.status_item,
             None,
             rumps.MenuItem("Start Recording", callback=self._toggle_recording),
+            rumps.MenuItem("⏹️ Cancel", callback=self._cancel_current),
             None,
             rumps.MenuItem("Settings", callback=self._show_settings),
             rumps.MenuItem("Open Config Folder", callback=self._open_config),
+            self.profile_item,
+            rumps.MenuItem("⏱️ Calibrate Models", callback=self._calibrate_models),
             None,
             rumps.MenuItem("📝 Add Correction", callback=self._add_correction),
             rumps.MenuItem("📚 View Corrections", callback=self._view_corrections),
             rumps.MenuItem("🗑️ Delete Correction", callback=self._delete_correction),
+            rumps.MenuItem("💡 Review Suggestions", callback=self._review_suggestions),
+            None,
+            rumps.MenuItem("🔍 Search History", callback=self._search_history),
+            rumps.MenuItem("📋 Re-paste Last", callback=self._repaste_last),
+            rumps.MenuItem("🔁 Re-transcribe Last With…", callback=self._retranscribe_last),
             None,
             rumps.MenuItem("About", callback=self._show_about),
             rumps.MenuItem("Quit", callback=self._quit_app),
@@ -372,8 +641,15 @@ class JarvisVoiceApp:
     def _start_hotkey_listener(self):
         """Start listening for global hotkeys - using right Option key"""
 
+        cancel_key = getattr(keyboard.Key, self.config.get("cancel_key", "esc"), None)
+
         def on_press(key):
             try:
+                if cancel_key is not None and key == cancel_key:
+                    if self.is_recording or self._current_job is not None:
+                        self._cancel_current()
+                    return
+
                 # Check for right Option key (alt_r)
                 if key == keyboard.Key.alt_r:
                     if not self.hotkey_pressed:
@@ -410,18 +686,26 @@ class JarvisVoiceApp:
 
     def _start_recording(self):
         """Start recording"""
-        if not self.model_loaded:
+        self.resources.touch()
+        if self.resources.unloaded:
+            # Reload the idle-unloaded model while the user is speaking
+            self.resources.prewarm()
+        elif not self.model_loaded:
             rumps.notification(
                 "Jarvis Voice", "Please wait", "Model is still loading..."
             )
             return
-
-        if not self.transcriber:
+        elif not self.transcriber:
             rumps.notification(
                 "Jarvis Voice", "Error", "Model not loaded. Check console."
             )
             return
 
+        # The pending decode is for text the user has moved on from
+        if self._current_job is not None and self.config.get("drop_superseded_jobs", True):
+            print("New recording started - dropping superseded transcription")
+            self._current_job.set()
+
         self.is_recording = True
         self.comm.update_status.emit("recording")
 
@@ -447,30 +731,96 @@ class JarvisVoiceApp:
         audio_data = self.recorder.stop_recording()
         print("Recording stopped. Processing...")
 
+        # Text goes to whichever app has focus now
+        app_id = frontmost_app()
+
+        cancel_event = threading.Event()
+        self._current_job = cancel_event
         threading.Thread(
-            target=self._process_audio, args=(audio_data,), daemon=True
+            target=self._process_audio,
+            args=(audio_data, cancel_event, app_id),
+            daemon=True,
         ).start()
 
-    def _process_audio(self, audio_data: np.ndarray):
+    def _cancel_current(self, _=None):
+        """Abort the recording or transcription in progress"""
+        if self.is_recording:
+            self.is_recording = False
+            self.recorder.stop_recording()
+            print("Recording cancelled")
+        if self._current_job is not None:
+            self._current_job.set()
+            print("Transcription cancelled")
+        self.comm.update_status.emit("ready")
+
+    def _process_audio(self, audio_data: np.ndarray, cancel_event=None, app_id=None):
         """Process audio and type text"""
+        cancel_event = cancel_event or threading.Event()
         try:
+            start = time.perf_counter()
             language = self.config.get("language", "en")
-            text = self.transcriber.transcribe(audio_data, language)
+            profile = self.profiles.get(app_id)
+            if profile.name:
+                print(f"Using profile '{profile.name}' for {app_id}")
+            recorded_audio = audio_data
+            if self.conditioner is not None and len(audio_data):
+                audio_data = self.conditioner.process(audio_data)
+                print(f"Audio conditioned in {(time.perf_counter() - start) * 1000:.1f}ms")
+            with self.resources.in_use():
+                # Reloads if the watchdog unloaded the model during recording
+                if not self.resources.ensure_loaded(60):
+                    raise RuntimeError("Model did not load in time")
+                transcriber = self.transcriber
+                text = transcriber.transcribe(
+                    audio_data, language, cancel_event, prompt=profile.prompt
+                )
+            trace = transcriber.last_trace
+            print(f"Latency trace: {trace}")
 
+            if cancel_event.is_set():
+                # Cancelled or superseded; whoever cancelled owns the status display
+                print("Discarded cancelled transcription")
+                return
+
+            METRICS.inc("utterances_total")
+            METRICS.inc("audio_seconds_total", len(audio_data) / self.recorder.sample_rate)
             if text:
                 print(f"Transcribed (raw): {text}")
+                raw_text = text
                 # Apply corrections
-                text = self._process_text_with_corrections(text)
+                text = self._process_text_with_corrections(text, app_id)
                 print(f"Transcribed (corrected): {text}")
+                utterance_id = None
+                if self.history:
+                    utterance_id = self.history.record(
+                        raw_text,
+                        text,
+                        model=transcriber.model_size,
+                        language=language,
+                        audio_seconds=len(audio_data) / self.recorder.sample_rate,
+                        decode_ms=trace.get("decode_ms"),
+                        total_ms=round((time.perf_counter() - start) * 1000, 1),
+                    )
                 self.comm.update_status.emit("typing")
                 self.comm.type_text.emit(text)
             else:
+                utterance_id = None
                 print("No speech detected")
+                METRICS.inc("empty_results_total")
                 self.comm.update_status.emit("ready")
 
+            if self.audio_store:
+                # Kept even when nothing was heard: those are worth retrying on a
+                # bigger model. Stored unconditioned with the app, so re-decoding
+                # goes through the same pipeline and profile
+                self.audio_store.save(utterance_id or uuid.uuid4().hex, recorded_audio, app_id)
+
         except Exception as e:
             print(f"Error processing audio: {e}")
             self.comm.update_status.emit("ready")
+        finally:
+            if self._current_job is cancel_event:
+                self._current_job = None
 
     def _type_text(self, text: str):
         """Type text into active application"""
@@ -488,12 +838,15 @@ class JarvisVoiceApp:
 
         except Exception as e:
             print(f"Error typing text: {e}")
+            METRICS.inc("injection_failures_total")
             self.comm.update_status.emit("ready")
 
     def _show_settings(self, _):
         """Show settings window"""
         hotkey = self.config["hotkey"]
         model = self.config["model_size"]
+        scheduler = self.transcriber.scheduler if self.transcriber else None
+        batching = scheduler.stats() if scheduler else "off"
 
         settings_text = f"""
 Current Settings:
@@ -501,17 +854,65 @@ Current Settings:
 Hotkey: Right Option Key (alt_r)
 Model: {model}
 Language: {self.config.get("language", "en")}
+Latency budget: {self.config.get("max_latency_ms") or "off"} ms
+Decoder threads: {self.config.get("decoder_threads", "auto")}
+Batching: {batching}
+Memory: {self.resources.stats()}
+Audio retention: {self.audio_store.stats() if self.audio_store else "off"}
+App profiles: {", ".join(self.profiles.profiles) or "none"} (edit {PROFILES_FILE.name})
 
 To change settings, edit:
 {CONFIG_FILE}
 
 Note: This version uses Right Option key only
 Valid models: tiny, base, small, medium, large-v3
+(quantized variants such as base.en-q5_0 also work)
+Set max_latency_ms and use Calibrate Models to pick automatically.
 
 After editing, restart Jarvis Voice.
 """
         rumps.alert(title="Settings", message=settings_text)
 
+    def _calibrate_models(self, _):
+        """Benchmark every installed model on the reference clip"""
+
+        def calibrate():
+            try:
+                registry = ModelRegistry(calibration_file=CALIBRATION_FILE)
+                results = registry.calibrate(language=self.config.get("language", "en"))
+                failed = [name for name, stats in results.items() if "error" in stats]
+                rumps.notification(
+                    "Jarvis Voice",
+                    "✅ Calibration Complete",
+                    f"Measured {len(results) - len(failed)} models"
+                    + (f", failed: {', '.join(failed)}" if failed else ""),
+                )
+            except Exception as e:
+                print(f"Error calibrating models: {e}")
+                rumps.notification(
+                    "Jarvis Voice", "❌ Error", f"Could not calibrate models: {e}"
+                )
+
+        rumps.notification(
+            "Jarvis Voice", "Calibrating", "Timing installed models, please wait..."
+        )
+        threading.Thread(target=calibrate, daemon=True).start()
+
+    def _toggle_profiler(self, _):
+        """Start or stop a sampling profiler capture of all threads"""
+        if self.profiler.running:
+            self.profiler.stop()
+            return
+
+        def done(path):
+            self.profile_item.title = "🔬 Capture Profile"
+            rumps.notification("Jarvis Voice", "🔬 Profile Saved", str(path))
+
+        duration = self.config.get("profile_duration_s", 10)
+        self.profile_item.title = "⏹️ Stop Profiling"
+        self.profiler.start(duration, on_done=done)
+        print(f"Profiling all threads for {duration}s...")
+
     def _open_config(self, _):
         """Open config folder in Finder securely"""
         try:
@@ -557,6 +958,9 @@ After editing, restart Jarvis Voice.
                         self.corrections["auto_corrections"] = {}
 
                     self.corrections["auto_corrections"][wrong] = correct
+                    rejected = self.corrections.get("rejected_suggestions", [])
+                    if wrong.lower() in rejected:
+                        rejected.remove(wrong.lower())
                     self._save_corrections()
 
                     rumps.notification(
@@ -599,6 +1003,42 @@ After editing, restart Jarvis Voice.
                 "Jarvis Voice", "❌ Error", f"Could not view corrections: {e}"
             )
 
+    def _review_suggestions(self, _):
+        """Accept or reject corrections mined from history"""
+        try:
+            suggestions = self.corrections.get("suggested_corrections", {})
+            if not suggestions:
+                rumps.alert(
+                    title="Correction Suggestions",
+                    message="No suggestions yet.\n\nThey are mined from your transcript history.",
+                )
+                return
+
+            for wrong, correct in list(suggestions.items()):
+                choice = rumps.alert(
+                    title="Correction Suggestion",
+                    message=f"Replace '{wrong}' with '{correct}'?",
+                    ok="Accept",
+                    cancel="Reject",
+                    other="Later",
+                )
+                if choice == 1:
+                    self.corrections.setdefault("auto_corrections", {})[wrong] = correct
+                    del suggestions[wrong]
+                    print(f"Accepted correction: '{wrong}' → '{correct}'")
+                elif choice == 0:
+                    self.corrections.setdefault("rejected_suggestions", []).append(wrong)
+                    del suggestions[wrong]
+                else:
+                    break
+
+            self._save_corrections()
+        except Exception as e:
+            print(f"Error reviewing suggestions: {e}")
+            rumps.notification(
+                "Jarvis Voice", "❌ Error", f"Could not review suggestions: {e}"
+            )
+
     def _delete_correction(self, _):
         """Delete a correction from the list"""
         try:
@@ -637,8 +1077,12 @@ After editing, restart Jarvis Voice.
                         wrong_to_delete = sorted_items[selection - 1][0]
                         correct_value = sorted_items[selection - 1][1]
 
-                        # Delete it
+                        # Delete it, and keep the miner from proposing it again
+                        # from transcripts the correction was applied to
                         del self.corrections["auto_corrections"][wrong_to_delete]
+                        rejected = self.corrections.setdefault("rejected_suggestions", [])
+                        if wrong_to_delete.lower() not in rejected:
+                            rejected.append(wrong_to_delete.lower())
                         self._save_corrections()
 
                         rumps.notification(
@@ -667,11 +1111,137 @@ After editing, restart Jarvis Voice.
                 "Jarvis Voice", "❌ Error", f"Could not delete correction: {e}"
             )
 
+    def _search_history(self, _):
+        """Search past transcripts and optionally re-paste one"""
+        if not self.history:
+            rumps.alert(title="Search History", message="History is disabled in config.")
+            return
+
+        try:
+            query = rumps.Window(
+                title="Search History",
+                message="Search past transcriptions (leave empty for recent):",
+                default_text="",
+                dimensions=(400, 24),
+            ).run()
+            if not query.clicked:
+                return
+
+            results = self.history.search(query.text or "", limit=15)
+            if not results:
+                rumps.alert(title="Search History", message="No matching transcriptions.")
+                return
+
+            results_list = "\n".join(
+                f"{i + 1}. {time.strftime('%b %d %H:%M', time.localtime(r['created_at']))}"
+                f"  {r['corrected_text'][:80]}"
+                for i, r in enumerate(results)
+            )
+            response = rumps.Window(
+                title="Search History",
+                message=f"Enter a number to paste it again:\n\n{results_list}",
+                default_text="",
+                dimensions=(400, 24),
+            ).run()
+
+            if response.clicked and response.text:
+                try:
+                    selection = int(response.text.strip())
+                    if 1 <= selection <= len(results):
+                        self.comm.type_text.emit(results[selection - 1]["corrected_text"])
+                except ValueError:
+                    rumps.notification(
+                        "Jarvis Voice", "❌ Invalid Input", "Please enter a valid number"
+                    )
+        except Exception as e:
+            print(f"Error searching history: {e}")
+            rumps.notification("Jarvis Voice", "❌ Error", f"Could not search history: {e}")
+
+    def _repaste_last(self, _):
+        """Type the last transcription again without re-decoding"""
+        last = self.history.last() if self.history else None
+        if not last:
+            rumps.notification("Jarvis Voice", "Nothing to paste", "No transcriptions yet")
+            return
+        self.comm.type_text.emit(last["corrected_text"])
+
+    def _retranscribe_last(self, _):
+        """Decode the last stored recording again with another model"""
+        if not self.audio_store:
+            rumps.alert(
+                title="Re-transcribe Last",
+                message="Audio retention is off. Set audio_retention in config to keep recordings.",
+            )
+            return
+        utterance_id = self.audio_store.latest()
+        if utterance_id is None:
+            rumps.notification("Jarvis Voice", "Nothing to re-transcribe", "No recordings stored yet")
+            return
+
+        installed = ", ".join(ModelRegistry().discover()) or "none found"
+        response = rumps.Window(
+            title="Re-transcribe Last",
+            message=f"Model to decode the last recording with:\n\nInstalled: {installed}",
+            default_text="large-v3",
+            dimensions=(300, 24),
+        ).run()
+        model_name = response.text.strip() if response.clicked else ""
+        if not model_name:
+            return
+
+        def retranscribe():
+            model = None
+            try:
+                stored = self.audio_store.load(utterance_id)
+                if stored is None:
+                    raise RuntimeError("the recording is no longer stored")
+                audio, app_id = stored
+                profile = self.profiles.get(app_id)
+                if self.conditioner is not None:
+                    audio = self.conditioner.process(audio)
+
+                language = self.config.get("language", "en")
+                model = WhisperCPP(model_name, threads=self.config.get("decoder_threads", "auto"))
+                raw_text = model.transcribe(audio, language, prompt=profile.prompt)
+                METRICS.record_decode(model.last_trace)
+                print(f"Re-transcribed with {model_name}: {model.last_trace}")
+                if not raw_text:
+                    rumps.notification("Jarvis Voice", model_name, "No speech detected")
+                    return
+
+                text = self._process_text_with_corrections(raw_text, app_id)
+                if self.history:
+                    self.history.record(
+                        raw_text,
+                        text,
+                        model=model_name,
+                        language=language,
+                        audio_seconds=len(audio) / self.recorder.sample_rate,
+                        decode_ms=model.last_trace.get("decode_ms"),
+                    )
+                hint = "\n(Re-paste Last types it)" if self.history else ""
+                rumps.notification(
+                    "Jarvis Voice", f"🔁 Re-transcribed with {model_name}", text[:100] + hint
+                )
+            except Exception as e:
+                print(f"Error re-transcribing: {e}")
+                rumps.notification("Jarvis Voice", "❌ Error", f"Could not re-transcribe: {e}")
+            finally:
+                if model:
+                    model.close()
+
+        threading.Thread(target=retranscribe, daemon=True).start()
+
     def _quit_app(self, _=None):
         """Quit the app and cleanup resources"""
         print("Quitting Jarvis Voice...")
         if hasattr(self, "hotkey_listener"):
             self.hotkey_listener.stop()
+        self.resources.stop()
+        if self.service:
+            self.service.stop()
+        if self.history:
+            self.history.close()
         if hasattr(self, "qt_app"):
             self.qt_app.quit()
         return True  # Allow the quit to proceed
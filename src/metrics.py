@@ -0,0 +1,190 @@
+"""
+Metrics for Jarvis Voice
+Counters and histograms aggregated per thread, exported in Prometheus text format
+"""
+
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from pathlib import Path
+
+PREFIX = "jarvis_voice"
+
+COUNTERS = {
+    "utterances_total": "Utterances transcribed (dictations or batch files)",
+    "audio_seconds_total": "Seconds of audio transcribed",
+    "service_requests_total": "Requests served by the local transcription service",
+    "decoder_runs_total": "whisper-cli invocations",
+    "decode_timeouts_total": "whisper-cli runs killed for exceeding the timeout",
+    "decoder_failures_total": "whisper-cli runs that exited non-zero",
+    "decodes_cancelled_total": "Decodes cancelled or superseded before finishing",
+    "empty_results_total": "Transcriptions that produced no text",
+    "injection_failures_total": "Errors typing text into the active application",
+}
+
+HISTOGRAMS = {
+    "decode_latency_seconds": (
+        "Wall time of one whisper-cli run",
+        (0.1, 0.25, 0.5, 1, 2, 5, 10, 30),
+    ),
+    "realtime_factor": (
+        "Decode time divided by audio duration",
+        (0.05, 0.1, 0.2, 0.3, 0.5, 1, 2),
+    ),
+}
+
+
+def _format_value(value) -> str:
+    """Full-precision sample value; %g would round large counters"""
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class _Shard:
+    """One thread's private metric values"""
+
+    __slots__ = ("thread", "counters", "buckets", "sums")
+
+    def __init__(self, thread):
+        self.thread = thread
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.buckets = {name: [0] * (len(spec[1]) + 1) for name, spec in HISTOGRAMS.items()}
+        self.sums = dict.fromkeys(HISTOGRAMS, 0.0)
+
+    def merge(self, other: "_Shard"):
+        """Add another shard's values into this one"""
+        for name, value in other.counters.items():
+            self.counters[name] += value
+        for name, counts in other.buckets.items():
+            mine = self.buckets[name]
+            for i, count in enumerate(counts):
+                mine[i] += count
+            self.sums[name] += other.sums[name]
+
+
+class Metrics:
+    """Lock-free on the hot path: each thread only ever writes its own shard
+
+    Recording touches a thread-local shard, so dictation threads never
+    contend. The lock is only taken when a thread records for the first
+    time and when exporting, which folds in shards of finished threads.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards = []
+        self._retired = _Shard(None)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._retire_finished()
+                self._shards.append(shard)
+            self._local.shard = shard
+        return shard
+
+    def _retire_finished(self):
+        """Fold shards of dead threads into the retired totals (lock held)"""
+        live = []
+        for shard in self._shards:
+            if shard.thread.is_alive():
+                live.append(shard)
+            else:
+                self._retired.merge(shard)
+        self._shards = live
+
+    def inc(self, name: str, value: float = 1):
+        """Increment a counter"""
+        self._shard().counters[name] += value
+
+    def observe(self, name: str, value: float):
+        """Record a histogram observation"""
+        shard = self._shard()
+        shard.buckets[name][bisect_left(HISTOGRAMS[name][1], value)] += 1
+        shard.sums[name] += value
+
+    def record_decode(self, trace: dict, cancelled: bool = False):
+        """Record one whisper-cli run from a WhisperCPP trace"""
+        if not trace:
+            return
+        self.inc("decoder_runs_total")
+        if cancelled:
+            self.inc("decodes_cancelled_total")
+            return
+        if trace.get("returncode"):
+            self.inc("decoder_failures_total")
+            return
+
+        decode_s = trace.get("decode_ms", 0) / 1000
+        self.observe("decode_latency_seconds", decode_s)
+        if trace.get("audio_s"):
+            self.observe("realtime_factor", decode_s / trace["audio_s"])
+
+    def snapshot(self) -> _Shard:
+        """Totals across all threads"""
+        with self._lock:
+            self._retire_finished()
+            total = _Shard(None)
+            total.merge(self._retired)
+            for shard in self._shards:
+                total.merge(shard)
+        return total
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        total = self.snapshot()
+        lines = []
+        for name, help_text in COUNTERS.items():
+            metric = f"{PREFIX}_{name}"
+            lines += [
+                f"# HELP {metric} {help_text}",
+                f"# TYPE {metric} counter",
+                f"{metric} {_format_value(total.counters[name])}",
+            ]
+        for name, (help_text, bounds) in HISTOGRAMS.items():
+            metric = f"{PREFIX}_{name}"
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+            cumulative = 0
+            for bound, count in zip(list(bounds) + ["+Inf"], total.buckets[name]):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+            lines += [
+                f"{metric}_sum {_format_value(total.sums[name])}",
+                f"{metric}_count {cumulative}",
+            ]
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically write metrics for node_exporter's textfile collector"""
+        path = Path(path).expanduser()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+        try:
+            # mkstemp creates 0600; node_exporter usually runs as another user
+            os.fchmod(fd, 0o644)
+            with os.fdopen(fd, "w") as f:
+                f.write(self.render())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def start_textfile_writer(self, path, interval_s: float = 15):
+        """Rewrite the textfile periodically from a background thread"""
+
+        def write_loop():
+            while True:
+                try:
+                    self.write_textfile(path)
+                except OSError as e:
+                    print(f"Error writing metrics: {e}")
+                threading.Event().wait(interval_s)
+
+        threading.Thread(target=write_loop, name="MetricsWriter", daemon=True).start()
+
+
+# Process-wide registry shared by the app, service and batch CLI
+METRICS = Metrics()
@@ -0,0 +1,129 @@
+"""
+On-demand sampling profiler for Jarvis Voice
+Samples every thread's Python stack and writes flamegraph-compatible output
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Optional
+
+
+def _frame_label(frame) -> str:
+    """function (file:line) label for one stack frame"""
+    code = frame.f_code
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    # ';' separates frames in the folded format
+    return label.replace(";", ":")
+
+
+class SamplingProfiler:
+    """Samples all threads for a fixed duration
+
+    Nothing runs while the profiler is off; when on, a single thread walks
+    sys._current_frames() every interval. Results are written as folded
+    stacks (for flamegraph.pl, speedscope or inferno) plus a text summary
+    of the hottest frames.
+    """
+
+    def __init__(self, output_dir, interval_s: float = 0.005):
+        self.output_dir = Path(output_dir)
+        self.interval_s = interval_s
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, duration_s: float, on_done: Optional[Callable[[Path], None]] = None):
+        """Begin sampling for duration_s seconds in the background"""
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(duration_s, on_done), name="SamplingProfiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """End the capture early; results are still written"""
+        self._stop.set()
+
+    def _run(self, duration_s: float, on_done):
+        """Sampling loop"""
+        stacks = Counter()
+        own_ident = threading.get_ident()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + duration_s
+
+        while not self._stop.is_set() and time.perf_counter() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                stacks[";".join(reversed(labels))] += 1
+            samples += 1
+            self._stop.wait(self.interval_s)
+
+        elapsed = time.perf_counter() - started
+        path = self._write(stacks, samples, elapsed)
+        print(f"Profile written: {path}")
+        if on_done:
+            on_done(path)
+
+    def _write(self, stacks: Counter, samples: int, elapsed: float) -> Path:
+        """Write folded stacks and a hottest-frames summary"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = time.strftime("profile-%Y%m%d-%H%M%S")
+        folded_path = self.output_dir / f"{stem}.folded"
+        summary_path = self.output_dir / f"{stem}-summary.txt"
+
+        with open(folded_path, "w") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        self_counts = Counter()
+        total_counts = Counter()
+        thread_counts = Counter()
+        for stack, count in stacks.items():
+            frames = stack.split(";")
+            thread_counts[frames[0]] += count
+            if len(frames) > 1:
+                self_counts[frames[-1]] += count
+                for label in set(frames[1:]):
+                    total_counts[label] += count
+
+        total = sum(stacks.values()) or 1
+        lines = [
+            f"Jarvis Voice profile: {samples} samples over {elapsed:.1f}s "
+            f"every {self.interval_s * 1000:.0f}ms",
+            f"Flamegraph input: {folded_path.name}",
+            "",
+            "Samples by thread:",
+            *(f"  {count:>7}  {name}" for name, count in thread_counts.most_common()),
+            "",
+            "Hottest frames (self):",
+            *(
+                f"  {count:>7}  {count / total:6.1%}  {label}"
+                for label, count in self_counts.most_common(25)
+            ),
+            "",
+            "Hottest frames (inclusive):",
+            *(
+                f"  {count:>7}  {count / total:6.1%}  {label}"
+                for label, count in total_counts.most_common(25)
+            ),
+        ]
+        with open(summary_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        return summary_path
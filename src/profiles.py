@@ -0,0 +1,161 @@
+"""
+Per-application profiles for Jarvis Voice
+Corrections and vocabulary keyed by the frontmost app, compiled lazily and cached
+"""
+
+import json
+import threading
+from collections import namedtuple
+from pathlib import Path
+from typing import Optional
+
+from corrections import CorrectionMatcher
+
+try:
+    from AppKit import NSWorkspace
+except ImportError:  # Not on macOS / PyObjC unavailable
+    NSWorkspace = None
+
+
+DEFAULT_PROFILES = {
+    # "IDE": {
+    #     "apps": ["com.microsoft.VSCode", "PyCharm"],
+    #     "auto_corrections": {"pie charm": "PyCharm"},
+    #     "custom_words": ["pytest", "asyncio"],
+    #     "context_phrases": [],
+    # }
+    "profiles": {},
+}
+
+# A compiled profile: name (None for global), correction matcher, decoder prompt
+CompiledProfile = namedtuple("CompiledProfile", ["name", "matcher", "prompt"])
+
+# An application as profiles can list it: by bundle identifier or by name
+AppId = namedtuple("AppId", ["bundle_id", "name"])
+
+
+def frontmost_app() -> Optional[AppId]:
+    """Bundle identifier and name of the frontmost application, if it can be found"""
+    if NSWorkspace is None:
+        return None
+    try:
+        app = NSWorkspace.sharedWorkspace().frontmostApplication()
+        if app is None:
+            return None
+        bundle_id, name = app.bundleIdentifier(), app.localizedName()
+        return AppId(str(bundle_id) if bundle_id else None, str(name) if name else None)
+    except Exception as e:
+        print(f"Error reading frontmost app: {e}")
+        return None
+
+
+def _unique(items) -> list:
+    """Items in order without duplicates or blanks"""
+    seen = set()
+    result = []
+    for item in items:
+        item = item.strip()
+        if item and item.lower() not in seen:
+            seen.add(item.lower())
+            result.append(item)
+    return result
+
+
+class ProfileManager:
+    """Resolves the profile for an app and caches its compiled matcher and prompt
+
+    Profiles layer on top of the global corrections and vocabulary: profile
+    corrections override global ones and profile words are added to global
+    ones. Nothing is compiled until a profile is first used, and the cache
+    is rebuilt only when profiles.json or the global maps change.
+    """
+
+    def __init__(self, profiles_path, corrections: dict, vocabulary: dict):
+        self.path = Path(profiles_path)
+        self.corrections = corrections
+        self.vocabulary = vocabulary
+        self._lock = threading.Lock()
+        self._cache = {}
+        self._mtime = None
+        self.profiles = {}
+        self._app_index = {}
+        self._reload()
+
+    def _reload(self):
+        """(Re)read profiles.json and index profiles by app id and name"""
+        if not self.path.exists():
+            with open(self.path, "w") as f:
+                json.dump(DEFAULT_PROFILES, f, indent=2)
+
+        try:
+            with open(self.path, "r") as f:
+                self.profiles = json.load(f).get("profiles", {})
+        except (OSError, ValueError) as e:
+            print(f"Error reading profiles: {e}")
+            self.profiles = {}
+
+        self._app_index = {
+            app.lower(): name
+            for name, profile in self.profiles.items()
+            for app in profile.get("apps", [])
+        }
+        self._mtime = self.path.stat().st_mtime
+        self._cache.clear()
+
+    def invalidate(self):
+        """Drop compiled profiles after the global corrections or vocabulary change"""
+        with self._lock:
+            self._cache.clear()
+
+    def profile_corrections(self) -> dict:
+        """Corrections from every profile, merged (for excluding them from mining)"""
+        with self._lock:
+            merged = {}
+            for profile in self.profiles.values():
+                merged.update(profile.get("auto_corrections", {}))
+            return merged
+
+    def profile_for(self, app_id) -> Optional[str]:
+        """Name of the profile that applies to an app, if any
+
+        app_id is a single identifier or several (e.g. an AppId); a profile
+        listing any of them applies.
+        """
+        identifiers = (app_id,) if isinstance(app_id, str) else app_id or ()
+        for identifier in identifiers:
+            if identifier and identifier.lower() in self._app_index:
+                return self._app_index[identifier.lower()]
+        return None
+
+    def get(self, app_id) -> CompiledProfile:
+        """Compiled profile for an app, falling back to the global one"""
+        with self._lock:
+            try:
+                if self.path.stat().st_mtime != self._mtime:
+                    self._reload()
+            except OSError:
+                pass
+
+            name = self.profile_for(app_id)
+            compiled = self._cache.get(name)
+            if compiled is None:
+                compiled = self._compile(name)
+                self._cache[name] = compiled
+            return compiled
+
+    def _compile(self, name: Optional[str]) -> CompiledProfile:
+        """Build the matcher and prompt for a profile (None for global only)"""
+        profile = self.profiles.get(name, {}) if name else {}
+
+        corrections = {
+            **self.corrections.get("auto_corrections", {}),
+            **profile.get("auto_corrections", {}),
+        }
+        terms = _unique(
+            self.vocabulary.get("custom_words", [])
+            + profile.get("custom_words", [])
+            + self.vocabulary.get("context_phrases", [])
+            + profile.get("context_phrases", [])
+        )
+        prompt = ", ".join(terms) or None
+        return CompiledProfile(name, CorrectionMatcher(corrections), prompt)
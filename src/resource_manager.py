@@ -0,0 +1,220 @@
+"""
+Resource management for Jarvis Voice
+Unloads the model when idle, pre-warms it on demand and watches memory use
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+def process_rss_mb() -> Optional[float]:
+    """Current resident set size of this process in MB"""
+    try:
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm", "r") as f:
+                pages = int(f.read().split()[1])
+            return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+        result = subprocess.run(
+            ["ps", "-o", "rss=", "-p", str(os.getpid())],
+            capture_output=True,
+            text=True,
+            timeout=2,
+        )
+        return int(result.stdout.strip()) / 1024
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def decoder_rss_mb() -> float:
+    """Combined resident size of running decoder (child) processes in MB"""
+    try:
+        result = subprocess.run(
+            ["ps", "-A", "-o", "ppid=,rss="], capture_output=True, text=True, timeout=2
+        )
+    except (OSError, subprocess.SubprocessError):
+        return 0.0
+    pid = os.getpid()
+    total_kb = 0
+    for line in result.stdout.splitlines():
+        fields = line.split()
+        if len(fields) == 2 and fields[0] == str(pid):
+            total_kb += int(fields[1])
+    return total_kb / 1024
+
+
+def decoder_peak_rss_mb() -> float:
+    """Peak RSS of the largest finished decoder subprocess in MB"""
+    peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss is bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class ResourceManager:
+    """Loads and unloads the model around usage and a memory ceiling
+
+    load() and unload() are supplied by the app. The watchdog unloads the
+    model after idle_timeout_s without use. Memory is the app's RSS plus
+    its running decoder processes; when that exceeds memory_limit_mb the
+    model is unloaded only if releasing what loading it cost would get
+    back under the limit. A limit the app can't meet with the model loaded
+    is reported instead of unloading and reloading around every decode.
+    """
+
+    def __init__(
+        self,
+        load: Callable[[], None],
+        unload: Callable[[], None],
+        idle_timeout_s: float = 1800,
+        memory_limit_mb: Optional[float] = None,
+        check_interval_s: float = 30,
+        on_over_limit: Optional[Callable[[float], None]] = None,
+    ):
+        self._load = load
+        self._unload = unload
+        self.idle_timeout_s = idle_timeout_s
+        self.memory_limit_mb = memory_limit_mb
+        self.check_interval_s = check_interval_s
+        self.on_over_limit = on_over_limit
+
+        self.loaded = False
+        self.unloaded = False  # True once the watchdog has released the model
+        self._lock = threading.Lock()
+        self._loaded_event = threading.Event()
+        self._loading = False
+        self._in_use = 0
+        self._last_used = time.monotonic()
+        self._model_cost_mb = None  # RSS added by the last load
+        self._loaded_rss_mb = None  # App RSS right after the last load
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Start the watchdog thread"""
+        threading.Thread(target=self._watchdog, daemon=True).start()
+
+    def stop(self):
+        """Stop the watchdog"""
+        self._stopped.set()
+
+    def load(self):
+        """Load the model now on the calling thread, unless already loading"""
+        with self._lock:
+            if self.loaded or self._loading:
+                return
+            self._loading = True
+        try:
+            rss_before = process_rss_mb()
+            self._load()
+            rss_after = process_rss_mb()
+            with self._lock:
+                if rss_before is not None and rss_after is not None:
+                    self._model_cost_mb = max(0.0, rss_after - rss_before)
+                    self._loaded_rss_mb = rss_after
+                self.loaded = True
+                self.unloaded = False
+                self._last_used = time.monotonic()
+            self._loaded_event.set()
+        finally:
+            with self._lock:
+                self._loading = False
+
+    def prewarm(self):
+        """Start loading the model in the background, e.g. while recording"""
+        if not self.loaded and not self._loading:
+            threading.Thread(target=self._load_in_background, daemon=True).start()
+
+    def _load_in_background(self):
+        """Background load; failures are reported, callers see wait_loaded() fail"""
+        try:
+            self.load()
+        except Exception as e:
+            print(f"Error loading model: {e}")
+
+    def wait_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Block until the model is loaded"""
+        return self._loaded_event.wait(timeout)
+
+    def ensure_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Reload the model if the watchdog released it, then wait until it is loaded"""
+        if self.unloaded:
+            self.prewarm()
+        return self.wait_loaded(timeout)
+
+    def touch(self):
+        """Record activity, postponing idle unload"""
+        self._last_used = time.monotonic()
+
+    @contextmanager
+    def in_use(self):
+        """Keep the model loaded for the duration of a decode"""
+        with self._lock:
+            self._in_use += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.monotonic()
+
+    def unload(self, reason: str) -> bool:
+        """Release the model if it is loaded and not in use"""
+        with self._lock:
+            if not self.loaded or self._in_use or self._loading:
+                return False
+            self.loaded = False
+            self.unloaded = True
+            self._loaded_event.clear()
+        print(f"Unloading model ({reason})")
+        self._unload()
+        return True
+
+    def stats(self) -> dict:
+        """Memory and model state for display"""
+        rss = process_rss_mb()
+        return {
+            "model_loaded": self.loaded,
+            "idle_s": round(time.monotonic() - self._last_used),
+            "process_rss_mb": round(rss, 1) if rss is not None else None,
+            "decoder_rss_mb": round(decoder_rss_mb(), 1),
+            "decoder_peak_rss_mb": round(decoder_peak_rss_mb(), 1),
+            "memory_limit_mb": self.memory_limit_mb,
+        }
+
+    def _enforce_memory_limit(self):
+        """Unload the model if that can bring app plus decoder memory under the limit"""
+        rss = process_rss_mb()
+        if rss is None:
+            return
+        total = rss + decoder_rss_mb()
+        if total <= self.memory_limit_mb:
+            return
+
+        if self.loaded and self._loaded_rss_mb is not None:
+            if self._loaded_rss_mb > self.memory_limit_mb:
+                print(
+                    f"Memory limit {self.memory_limit_mb}MB is below the app with the model "
+                    f"loaded ({self._loaded_rss_mb:.0f}MB); not unloading"
+                )
+            elif total - self._model_cost_mb <= self.memory_limit_mb:
+                self.unload(f"{total:.0f}MB over {self.memory_limit_mb}MB limit")
+        if self.on_over_limit:
+            self.on_over_limit(total)
+
+    def _watchdog(self):
+        """Periodically enforce the idle timeout and memory ceiling"""
+        while not self._stopped.wait(self.check_interval_s):
+            try:
+                idle = time.monotonic() - self._last_used
+                if self.idle_timeout_s and self.loaded and idle > self.idle_timeout_s:
+                    self.unload(f"idle for {int(idle)}s")
+
+                if self.memory_limit_mb:
+                    self._enforce_memory_limit()
+            except Exception as e:
+                print(f"Error in resource watchdog: {e}")
@@ -0,0 +1,244 @@
+"""
+Local transcription service for Jarvis Voice
+Lets other local tools share the app's resident model over localhost HTTP
+"""
+
+import hashlib
+import io
+import json
+import queue
+import threading
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import soundfile as sf
+
+from metrics import METRICS
+
+SAMPLE_RATE = 16000
+READ_CHUNK = 64 * 1024
+
+
+class ServiceError(Exception):
+    """Request rejected with an HTTP status"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def decode_audio(body: bytes, content_type: str) -> np.ndarray:
+    """Decode an uploaded clip to 16 kHz mono float32"""
+    if content_type.startswith("audio/l16") or content_type == "application/octet-stream":
+        # Raw little-endian 16-bit PCM at 16 kHz
+        if len(body) % 2:
+            raise ServiceError(400, "Raw PCM body must be whole 16-bit samples")
+        return np.frombuffer(body, dtype="<i2").astype(np.float32) / 32768.0
+
+    try:
+        audio, sample_rate = sf.read(io.BytesIO(body), dtype="float32")
+    except Exception as e:
+        raise ServiceError(400, f"Could not decode audio: {e}")
+    if sample_rate != SAMPLE_RATE:
+        raise ServiceError(400, f"Audio must be {SAMPLE_RATE} Hz, got {sample_rate}")
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    return audio
+
+
+class TranscriptionService:
+    """Queues, limits and coalesces transcription requests from local clients
+
+    Each client (the X-Client-Id header) may have per_client_limit distinct
+    decodes queued or running; requests identical to one in flight share its
+    result and don't count. Clients without X-Client-Id share one limit.
+    """
+
+    def __init__(
+        self,
+        transcribe: Callable[[np.ndarray, str], str],
+        port: int = 8765,
+        host: str = "127.0.0.1",
+        workers: int = 1,
+        queue_size: int = 32,
+        per_client_limit: int = 2,
+        max_upload_bytes: int = 50 * 1024 * 1024,
+    ):
+        self.transcribe = transcribe
+        self.host = host
+        self.port = port
+        self.per_client_limit = per_client_limit
+        self.max_upload_bytes = max_upload_bytes
+
+        self._jobs = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._in_flight = {}  # (audio digest, language) -> Future
+        self._client_active = {}  # client id -> active requests
+        self._workers = [
+            threading.Thread(target=self._work_loop, daemon=True) for _ in range(workers)
+        ]
+        self._server = None
+
+    def start(self):
+        """Start worker threads and the HTTP server"""
+        handler = type("Handler", (_RequestHandler,), {"service": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        for worker in self._workers:
+            worker.start()
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f"Transcription service listening on http://{self.host}:{self.port}")
+
+    def stop(self):
+        """Stop accepting requests and shut down workers"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        for _ in self._workers:
+            self._jobs.put(None)
+
+    def _work_loop(self):
+        """Decode queued jobs one at a time per worker"""
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            key, audio, language, future = job
+            try:
+                future.set_result(self.transcribe(audio, language))
+            except Exception as e:
+                future.set_exception(e)
+            finally:
+                with self._lock:
+                    self._in_flight.pop(key, None)
+
+    def submit(self, client_id: str, audio: np.ndarray, language: str) -> str:
+        """Transcribe audio for a client, sharing work with identical requests"""
+        key = (hashlib.sha1(audio.tobytes()).hexdigest(), language)
+
+        with self._lock:
+            # Joining an identical in-flight request costs nothing, so it isn't limited
+            future = self._in_flight.get(key)
+            counted = future is None
+            if counted:
+                if self._client_active.get(client_id, 0) >= self.per_client_limit:
+                    raise ServiceError(429, "Too many concurrent requests for this client")
+                future = Future()
+                try:
+                    self._jobs.put_nowait((key, audio, language, future))
+                except queue.Full:
+                    raise ServiceError(503, "Transcription queue is full")
+                self._in_flight[key] = future
+                self._client_active[client_id] = self._client_active.get(client_id, 0) + 1
+
+        try:
+            return future.result()
+        finally:
+            if counted:
+                with self._lock:
+                    self._release(client_id)
+
+    def _release(self, client_id: str):
+        """Drop one active request for a client (lock must be held)"""
+        remaining = self._client_active.get(client_id, 1) - 1
+        if remaining > 0:
+            self._client_active[client_id] = remaining
+        else:
+            self._client_active.pop(client_id, None)
+
+    def status(self) -> dict:
+        """Queue and client counters for the health endpoint"""
+        with self._lock:
+            return {
+                "queued": self._jobs.qsize(),
+                "in_flight": len(self._in_flight),
+                "clients": dict(self._client_active),
+            }
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end: POST /transcribe, GET /health, GET /metrics"""
+
+    service = None  # Set per server by TranscriptionService.start
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self) -> bytes:
+        """Read the upload incrementally, supporting chunked streaming"""
+        limit = self.service.max_upload_bytes
+        body = bytearray()
+
+        if "chunked" in self.headers.get("Transfer-Encoding", "").lower():
+            while True:
+                line = self.rfile.readline().split(b";")[0].strip()
+                try:
+                    size = int(line or b"0", 16)
+                except ValueError:
+                    raise ServiceError(400, "Malformed chunk size")
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                if len(body) + size > limit:
+                    raise ServiceError(413, "Upload too large")
+                body += self.rfile.read(size)
+                self.rfile.readline()
+            return bytes(body)
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > limit:
+            raise ServiceError(413, "Upload too large")
+        while len(body) < length:
+            chunk = self.rfile.read(min(READ_CHUNK, length - len(body)))
+            if not chunk:
+                break
+            body += chunk
+        return bytes(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, {"status": "ok", **self.service.status()})
+        elif path == "/metrics":
+            body = METRICS.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/transcribe":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            language = parse_qs(url.query).get("language", ["en"])[0]
+            # Every local caller has the same address, so clients that don't
+            # identify themselves share one "anonymous" limit
+            client_id = self.headers.get("X-Client-Id") or "anonymous"
+            body = self._read_body()
+            content_type = self.headers.get("Content-Type", "audio/wav").lower()
+            audio = decode_audio(body, content_type)
+            text = self.service.submit(client_id, audio, language)
+            METRICS.inc("service_requests_total")
+            self._send_json(200, {"text": text})
+        except ServiceError as e:
+            self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            print(f"Error in transcription service: {e}")
+            self._send_json(500, {"error": str(e)})
@@ -6,28 +6,156 @@ Uses the compiled whisper-cli with Metal GPU acceleration
 import subprocess
 import tempfile
 import os
+import re
+import json
+import sys
+import time
 import numpy as np
 import wave
 import soundfile as sf
 from pathlib import Path
 
 
+
+def _default_whisper_dir() -> Path:
+    """whisper.cpp bundled next to this file in the .app, else the user install"""
+    bundled = Path(__file__).resolve().parent / "whisper.cpp"
+    if (bundled / "bin" / "whisper-cli").exists():
+        return bundled
+    return Path.home() / "Applications" / "JarvisVoice" / "whisper.cpp"
+
+
+def cli_path(whisper_dir: Path) -> Path:
+    """whisper-cli in a source build (build/bin) or an app bundle (bin)"""
+    built = whisper_dir / "build" / "bin" / "whisper-cli"
+    return built if built.exists() else whisper_dir / "bin" / "whisper-cli"
+
+
+WHISPER_DIR = _default_whisper_dir()
+
+# Initial prompts beyond whisper's context (~224 tokens) are truncated anyway
+MAX_PROMPT_CHARS = 800
+
+# How often a running whisper-cli is checked for cancellation
+_CANCEL_POLL_S = 0.05
+
+# Buffer reused while reading a model through to prefetch it
+_PREFETCH_CHUNK = 1024 * 1024
+
+
+def prefetch_model(model_path):
+    """Warm the OS page cache with a model file
+
+    whisper-cli reads the model into its own memory on every run, so each
+    decoder process still holds a private copy; this only makes that read
+    come from RAM instead of disk. Nothing is kept resident in this process:
+    on Linux the kernel is asked to read ahead, elsewhere the file is read
+    through a small reused buffer.
+    """
+    with open(model_path, "rb") as f:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            return
+        buffer = bytearray(_PREFETCH_CHUNK)
+        while f.readinto(buffer):
+            pass
+
+
+# Decoder threads beyond which each model family stops getting faster
+_MODEL_THREAD_CAPS = {"tiny": 4, "base": 4, "small": 6, "medium": 8, "large": 8}
+
+
+def _sysctl_int(name: str):
+    """Read an integer sysctl on macOS, returning None if unavailable"""
+    try:
+        result = subprocess.run(
+            ["sysctl", "-n", name], capture_output=True, text=True, timeout=2
+        )
+        return int(result.stdout.strip()) if result.returncode == 0 else None
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def performance_core_count() -> int:
+    """Number of physical performance cores (P-cores on Apple Silicon)"""
+    if sys.platform == "darwin":
+        for name in ("hw.perflevel0.physicalcpu", "hw.physicalcpu"):
+            count = _sysctl_int(name)
+            if count:
+                return count
+    # os.cpu_count() reports logical CPUs; assume 2-way SMT elsewhere
+    return max(1, (os.cpu_count() or 2) // 2)
+
+
+def auto_thread_count(model_name: str) -> int:
+    """Pick a decoder thread count for a model based on core topology
+
+    One performance core is left for the UI, hotkey listener and audio
+    callback, and small models are capped where extra threads stop helping.
+    """
+    available = max(1, performance_core_count() - 1)
+    family = model_name.split("-")[0].split(".")[0]
+    return max(1, min(available, _MODEL_THREAD_CAPS.get(family, available)))
+
+
+def decoder_cpu_set(reserved: int = 1):
+    """CPUs decoder processes may run on, keeping the first `reserved` free
+
+    This only restricts the decoders: the app's own threads are not pinned,
+    so the scheduler may still run audio or UI work on decoder CPUs. What it
+    guarantees is that the reserved CPU never has decoder work on it, so
+    those threads always have an uncontended core to run on.
+
+    Returns None where CPU affinity isn't supported (macOS exposes no
+    affinity API, so pinning is a no-op there).
+    """
+    if not hasattr(os, "sched_getaffinity"):
+        return None
+    cpus = sorted(os.sched_getaffinity(0))
+    return set(cpus[reserved:]) or None
+
+
 class WhisperCPP:
     """Wrapper for whisper.cpp CLI"""
 
-    def __init__(self, model_name="base.en"):
-        """Initialize whisper.cpp transcriber"""
+    def __init__(
+        self, model_name="base.en", threads=None, processors=1, pin_cores=False, whisper_dir=None
+    ):
+        """Initialize whisper.cpp transcriber
+
+        threads: decoder threads, or None/"auto" to tune from core topology
+        processors: number of whisper-cli processors (-p)
+        pin_cores: keep decoder processes off the first CPU (see decoder_cpu_set)
+        whisper_dir: whisper.cpp directory, defaulting to WHISPER_DIR
+        """
         self.model_name = model_name
-        self.whisper_dir = Path.home() / "Applications" / "JarvisVoice" / "whisper.cpp"
+        self.threads = (
+            auto_thread_count(model_name) if threads in (None, "auto") else int(threads)
+        )
+        self.processors = max(1, int(processors))
+        self.cpu_set = decoder_cpu_set() if pin_cores else None
+        if pin_cores and self.cpu_set is None:
+            print("Note: CPU pinning is not supported on this platform, ignoring")
+        self.last_trace = {}
+        self.whisper_dir = Path(whisper_dir) if whisper_dir else WHISPER_DIR
         self.model_path = self.whisper_dir / "models" / f"ggml-{model_name}.bin"
-        self.cli_path = self.whisper_dir / "build" / "bin" / "whisper-cli"
+        self.cli_path = cli_path(self.whisper_dir)
 
         if not self.model_path.exists():
-            raise FileNotFoundError(f"Model not found: {self.model_path}")
+            available = ", ".join(ModelRegistry(self.whisper_dir).discover()) or "none"
+            raise FileNotFoundError(
+                f"Model not found: {self.model_path} (installed: {available})"
+            )
 
         if not self.cli_path.exists():
             raise FileNotFoundError(f"whisper-cli not found: {self.cli_path}")
 
+        # So the first decode doesn't pay for disk reads
+        prefetch_model(self.model_path)
+
+    def close(self):
+        """Release resources held for this model (none beyond the page cache today)"""
+
     # Valid ISO 639-1 language codes supported by Whisper
     VALID_LANGUAGES = {
         "en",
@@ -131,37 +259,126 @@ class WhisperCPP:
         "su",
     }
 
-    def transcribe(self, audio_data: np.ndarray, language: str = "en") -> str:
-        """Transcribe audio using whisper.cpp"""
-        if len(audio_data) == 0:
-            return ""
-
-        # Validate language code to prevent command injection
+    def _check_language(self, language: str) -> str:
+        """Validate language code to prevent command injection"""
         if language not in self.VALID_LANGUAGES:
             print(f"Warning: Invalid language code '{language}', defaulting to 'en'")
-            language = "en"
+            return "en"
+        return language
+
+    def _run_cli(
+        self,
+        input_paths: list,
+        language: str,
+        extra_args=(),
+        timeout=30,
+        cancel_event=None,
+        prompt=None,
+    ):
+        """Run whisper-cli on one or more WAV files
+
+        If cancel_event (anything with is_set()) becomes set, the process is
+        killed and its partial result returned with a non-zero exit code.
+        """
+        cmd = [str(self.cli_path), "-m", str(self.model_path)]
+        for path in input_paths:
+            cmd += ["-f", path]
+        cmd += [
+            "-l",
+            language,
+            "-t",
+            str(self.threads),
+            "-p",
+            str(self.processors),
+            "--no-timestamps",
+            *extra_args,
+        ]
+        if prompt:
+            # Passed as a single argv entry, never through a shell
+            cmd += ["--prompt", prompt[:MAX_PROMPT_CHARS]]
+
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        if self.cpu_set:
+            # Pinned from the parent: preexec_fn can deadlock in threaded processes.
+            # whisper-cli starts its worker threads after loading the model, so
+            # they inherit the mask.
+            try:
+                os.sched_setaffinity(proc.pid, self.cpu_set)
+            except OSError:
+                pass  # Already exited
+
+        if cancel_event is None:
+            try:
+                stdout, stderr = proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.communicate()
+                raise
+            return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+
+        # Poll so a cancelled decode is killed promptly instead of running on
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                stdout, stderr = proc.communicate(timeout=_CANCEL_POLL_S)
+                return subprocess.CompletedProcess(cmd, proc.returncode, stdout, stderr)
+            except subprocess.TimeoutExpired:
+                if cancel_event.is_set() or time.monotonic() > deadline:
+                    proc.kill()
+                    stdout, stderr = proc.communicate()
+                    if cancel_event.is_set():
+                        return subprocess.CompletedProcess(
+                            cmd, proc.returncode, stdout, stderr
+                        )
+                    raise subprocess.TimeoutExpired(cmd, timeout, stdout, stderr)
+
+    def _record_trace(self, audio_samples: int, start, written, finished, returncode, batch_size=1):
+        """Store timings and decoder settings of the last run"""
+        self.last_trace = {
+            "model": self.model_name,
+            "threads": self.threads,
+            "processors": self.processors,
+            "cpus": sorted(self.cpu_set) if self.cpu_set else "any",
+            "batch_size": batch_size,
+            "audio_s": round(audio_samples / 16000, 2),
+            "write_ms": round((written - start) * 1000, 1),
+            "decode_ms": round((finished - written) * 1000, 1),
+            "returncode": returncode,
+        }
+
+    def transcribe(
+        self, audio_data: np.ndarray, language: str = "en", cancel_event=None, prompt=None
+    ) -> str:
+        """Transcribe audio using whisper.cpp, returning "" if cancelled
+
+        prompt: optional initial prompt biasing the decoder towards vocabulary
+        """
+        if len(audio_data) == 0 or (cancel_event and cancel_event.is_set()):
+            return ""
+
+        language = self._check_language(language)
 
         # Create temporary WAV file
         with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp_file:
             tmp_path = tmp_file.name
 
         try:
+            start = time.perf_counter()
+
             # Save audio as 16-bit PCM WAV file (required by whisper.cpp)
             sf.write(tmp_path, audio_data, 16000, subtype="PCM_16")
+            written = time.perf_counter()
 
             # Run whisper-cli
-            cmd = [
-                str(self.cli_path),
-                "-m",
-                str(self.model_path),
-                "-f",
-                tmp_path,
-                "-l",
-                language,
-                "--no-timestamps",
-            ]
+            result = self._run_cli(
+                [tmp_path], language, cancel_event=cancel_event, prompt=prompt
+            )
+            self._record_trace(
+                len(audio_data), start, written, time.perf_counter(), result.returncode
+            )
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            if cancel_event and cancel_event.is_set():
+                return ""
 
             if result.returncode != 0:
                 print(f"whisper.cpp error: {result.stderr}")
@@ -184,3 +401,216 @@ class WhisperCPP:
             # Clean up temp file
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
+
+    def transcribe_batch(
+        self, audio_clips: list, language: str = "en", cancel_event=None, prompt=None
+    ) -> list:
+        """Transcribe several clips in one whisper-cli run
+
+        The model is loaded once for the whole batch; each clip's text is
+        read back from the .txt file whisper-cli writes next to its input.
+        """
+        results = [""] * len(audio_clips)
+        indices = [i for i, clip in enumerate(audio_clips) if len(clip) > 0]
+        if not indices:
+            return results
+
+        language = self._check_language(language)
+        tmp_dir = tempfile.mkdtemp(prefix="jarvis-batch-")
+        paths = [os.path.join(tmp_dir, f"clip{i}.wav") for i in indices]
+
+        try:
+            start = time.perf_counter()
+            for i, path in zip(indices, paths):
+                sf.write(path, audio_clips[i], 16000, subtype="PCM_16")
+            written = time.perf_counter()
+
+            result = self._run_cli(
+                paths,
+                language,
+                extra_args=["-otxt", "-np"],
+                timeout=30 * len(paths),
+                cancel_event=cancel_event,
+                prompt=prompt,
+            )
+            self._record_trace(
+                sum(len(audio_clips[i]) for i in indices),
+                start,
+                written,
+                time.perf_counter(),
+                result.returncode,
+                batch_size=len(paths),
+            )
+
+            if cancel_event and cancel_event.is_set():
+                return results
+
+            if result.returncode != 0:
+                print(f"whisper.cpp error: {result.stderr}")
+                return results
+
+            for i, path in zip(indices, paths):
+                txt_path = path + ".txt"
+                if os.path.exists(txt_path):
+                    with open(txt_path, "r") as f:
+                        results[i] = " ".join(line.strip() for line in f if line.strip())
+            return results
+
+        finally:
+            # Clean up temp files
+            for name in os.listdir(tmp_dir):
+                os.unlink(os.path.join(tmp_dir, name))
+            os.rmdir(tmp_dir)
+
+
+# ggml-<name>[-<quantization>].bin, e.g. ggml-base.en.bin, ggml-small-q5_1.bin
+MODEL_FILE_RE = re.compile(r"^ggml-(?P<base>.+?)(?:-(?P<quant>q\d+_[0-9k]+))?\.bin$")
+
+# Reference clip shipped with whisper.cpp, used to calibrate installed models
+REFERENCE_CLIP = WHISPER_DIR / "samples" / "jfk.wav"
+REFERENCE_TEXT = (
+    "And so my fellow Americans, ask not what your country can do for you, "
+    "ask what you can do for your country."
+)
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level edit distance normalised by reference length"""
+    ref = re.findall(r"[a-z0-9']+", reference.lower())
+    hyp = re.findall(r"[a-z0-9']+", hypothesis.lower())
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (ref_word != hyp_word),
+                )
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+class ModelRegistry:
+    """Discovers installed full and quantized models and their measured speed"""
+
+    def __init__(self, whisper_dir=None, calibration_file=None):
+        self.whisper_dir = Path(whisper_dir) if whisper_dir else WHISPER_DIR
+        self.models_dir = self.whisper_dir / "models"
+        self.calibration_file = Path(calibration_file) if calibration_file else None
+        self.calibration = self._load_calibration()
+
+    def _load_calibration(self) -> dict:
+        """Load saved calibration results, keyed by model name"""
+        if self.calibration_file and self.calibration_file.exists():
+            try:
+                with open(self.calibration_file, "r") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Warning: Could not read model calibration: {e}")
+        return {}
+
+    def _save_calibration(self):
+        """Persist calibration results"""
+        if not self.calibration_file:
+            return
+        with open(self.calibration_file, "w") as f:
+            json.dump(self.calibration, f, indent=2)
+
+    def discover(self) -> dict:
+        """Return installed models as name -> file info"""
+        models = {}
+        if not self.models_dir.exists():
+            return models
+
+        for path in sorted(self.models_dir.glob("ggml-*.bin")):
+            match = MODEL_FILE_RE.match(path.name)
+            if not match:
+                continue
+            name = path.name[len("ggml-") : -len(".bin")]
+            models[name] = {
+                "path": str(path),
+                "base": match.group("base"),
+                "quantization": match.group("quant"),
+                "size_bytes": path.stat().st_size,
+            }
+        return models
+
+    def calibrate(self, names=None, language: str = "en") -> dict:
+        """Time each model on the reference clip and record its accuracy
+
+        A model that fails (e.g. exceeds the whisper-cli timeout) is recorded
+        with its error and left out of select(); the others still count.
+        Results are saved after every model.
+        """
+        reference_clip = self.whisper_dir / "samples" / "jfk.wav"
+        if not reference_clip.exists():
+            reference_clip = REFERENCE_CLIP
+        if not reference_clip.exists():
+            raise FileNotFoundError(f"Reference clip not found: {reference_clip}")
+
+        audio, _ = sf.read(str(reference_clip), dtype="float32")
+        audio_seconds = len(audio) / 16000
+        available = self.discover()
+
+        for name in names or available:
+            if name not in available:
+                continue
+            try:
+                model = WhisperCPP(name, whisper_dir=self.whisper_dir)
+                try:
+                    # Warm-up run so page cache state doesn't skew the timing
+                    model.transcribe(audio, language)
+                    start = time.perf_counter()
+                    text = model.transcribe(audio, language)
+                    elapsed = time.perf_counter() - start
+                    returncode = model.last_trace.get("returncode")
+                finally:
+                    model.close()
+                if returncode:
+                    raise RuntimeError(f"whisper-cli exited with code {returncode}")
+            except (OSError, RuntimeError, subprocess.SubprocessError) as e:
+                self.calibration[name] = {"error": str(e), "calibrated_at": time.time()}
+                print(f"Could not calibrate {name}: {e}")
+            else:
+                self.calibration[name] = {
+                    "latency_ms": round(elapsed * 1000, 1),
+                    "rtf": round(elapsed / audio_seconds, 4),
+                    "wer": round(word_error_rate(REFERENCE_TEXT, text), 4),
+                    "size_bytes": available[name]["size_bytes"],
+                    "calibrated_at": time.time(),
+                }
+                print(f"Calibrated {name}: {self.calibration[name]}")
+            self._save_calibration()
+
+        return self.calibration
+
+    def select(self, max_latency_ms: float, language: str = "en"):
+        """Pick the most accurate calibrated model meeting the latency budget
+
+        Falls back to the fastest calibrated model when none meets the budget,
+        and returns None when nothing installed has been calibrated.
+        """
+        available = self.discover()
+        candidates = [
+            (name, stats)
+            for name, stats in self.calibration.items()
+            if name in available
+            and "latency_ms" in stats  # Skip models whose calibration failed
+            # English-only models can't serve other languages
+            and (language == "en" or not available[name]["base"].endswith(".en"))
+        ]
+        if not candidates:
+            return None
+
+        within_budget = [c for c in candidates if c[1]["latency_ms"] <= max_latency_ms]
+        if within_budget:
+            best = min(within_budget, key=lambda c: (c[1]["wer"], c[1]["latency_ms"]))
+        else:
+            best = min(candidates, key=lambda c: c[1]["latency_ms"])
+        return best[0]